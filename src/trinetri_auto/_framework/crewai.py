@@ -24,6 +24,7 @@ from typing import Any, Dict, Optional, Union
 import json
 import time
 from .._ids import get_correlation_id, new_agent_id, new_step_id
+from .._status import set_patch_status
 
 try:
     import crewai
@@ -34,6 +35,8 @@ try:
 except ImportError:
     CREWAI_AVAILABLE = False
 
+tracer = trace.get_tracer("trinetri.crewai")
+
 
 def patch_crewai() -> bool:
     """
@@ -87,7 +90,7 @@ def instrument_crewai() -> bool:
                 
                 # Create span for agent initialization
                 correlation_id = get_correlation_id()
-                with trace.get_tracer("trinetri.crewai").start_as_current_span(
+                with tracer.start_as_current_span(
                     "crewai.agent.init",
                     attributes={
                         "agent.correlation_id": correlation_id,
@@ -116,7 +119,7 @@ def instrument_crewai() -> bool:
                 step_id = new_step_id()
                 agent_id = getattr(self, '_trinetri_agent_id', new_agent_id())
                 
-                with trace.get_tracer("trinetri.crewai").start_as_current_span(
+                with tracer.start_as_current_span(
                     "crewai.agent.execute_task",
                     attributes={
                         "agent.correlation_id": correlation_id,
@@ -158,7 +161,7 @@ def instrument_crewai() -> bool:
                 step_id = new_step_id()
                 agent_id = getattr(agent, '_trinetri_agent_id', new_agent_id()) if agent else new_agent_id()
                 
-                with trace.get_tracer("trinetri.crewai").start_as_current_span(
+                with tracer.start_as_current_span(
                     "crewai.task.execute",
                     attributes={
                         "agent.correlation_id": correlation_id,
@@ -200,7 +203,7 @@ def instrument_crewai() -> bool:
                 correlation_id = get_correlation_id()
                 step_id = new_step_id()
                 
-                with trace.get_tracer("trinetri.crewai").start_as_current_span(
+                with tracer.start_as_current_span(
                     "crewai.crew.kickoff",
                     attributes={
                         "agent.correlation_id": correlation_id,
@@ -234,6 +237,7 @@ def instrument_crewai() -> bool:
         # Apply the agent init patch
         CrewAgent.__init__ = patched_agent_init
         
+        set_patch_status("CrewAI", True)
         return True
     except Exception:
         return False
@@ -264,7 +268,7 @@ def instrument_agent(agent_class: type, role: str) -> type:
             step_id = new_step_id()
             agent_id = getattr(self, '_trinetri_agent_id', new_agent_id())
             
-            with trace.get_tracer("trinetri.crewai").start_as_current_span(
+            with tracer.start_as_current_span(
                 f"crewai.agent.{method_name}",
                 attributes={
                     "agent.correlation_id": correlation_id,
@@ -24,6 +24,7 @@ from typing import Any, Dict, Optional
 import json
 import time
 from .._ids import get_correlation_id, new_step_id
+from .._status import set_patch_status
 
 try:
     from langgraph.graph.graph import CompiledGraph
@@ -34,6 +35,8 @@ try:
 except ImportError:
     LANGGRAPH_AVAILABLE = False
 
+tracer = trace.get_tracer("trinetri.langgraph")
+
 
 class TrinetriLGCallback:
     """LangGraph callback for OpenTelemetry span emission with universal attributes."""
@@ -156,7 +159,7 @@ def instrument_langgraph() -> bool:
             correlation_id = get_correlation_id()
             step_id = new_step_id()
             
-            with trace.get_tracer("trinetri.langgraph").start_as_current_span(
+            with tracer.start_as_current_span(
                 "lg.graph.invoke",
                 attributes={
                     "agent.correlation_id": correlation_id,
@@ -191,7 +194,7 @@ def instrument_langgraph() -> bool:
             correlation_id = get_correlation_id()
             step_id = new_step_id()
             
-            with trace.get_tracer("trinetri.langgraph").start_as_current_span(
+            with tracer.start_as_current_span(
                 "lg.graph.ainvoke",
                 attributes={
                     "agent.correlation_id": correlation_id,
@@ -217,6 +220,7 @@ def instrument_langgraph() -> bool:
         CompiledGraph.invoke = patched_invoke
         CompiledGraph.ainvoke = patched_ainvoke
         
+        set_patch_status("LangGraph", True)
         return True
     except Exception:
         return False
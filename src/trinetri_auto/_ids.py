@@ -19,13 +19,46 @@ contextvars for thread-safe access across async operations.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import uuid
+import os
+from collections import deque
 from contextvars import ContextVar
-from typing import Optional
+from typing import Deque, Optional
 
 # Context variables for thread-safe ID management
 _correlation_id_var: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
 
+# Pool of pre-generated 12-hex-char ID suffixes for agent and step IDs.
+# Refilling from a single os.urandom() call amortizes the syscall and
+# formatting cost across many IDs.
+_ID_BYTES = 6
+_ID_POOL_SIZE = 4096
+_ID_POOL: Deque[str] = deque()
+
+# ID prefixes
+_AGT = "agt-"
+_STP = "stp-"
+
+# A forked child must not hand out the IDs its parent is also using
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_ID_POOL.clear)
+
+
+def _refill_id_pool() -> None:
+    """Refill the ID pool with a fresh batch of random hex suffixes."""
+    raw = os.urandom(_ID_BYTES * _ID_POOL_SIZE).hex()
+    width = _ID_BYTES * 2
+    _ID_POOL.extend(raw[i:i + width] for i in range(0, len(raw), width))
+
+
+def _next_hex_id() -> str:
+    """Pop a random 12-hex-char suffix from the pool, refilling when empty."""
+    while True:
+        try:
+            return _ID_POOL.popleft()
+        except IndexError:
+            # Another thread may drain the refill first, hence the loop
+            _refill_id_pool()
+
 
 def new_correlation_id() -> str:
     """
@@ -34,7 +67,12 @@ def new_correlation_id() -> str:
     Returns:
         str: The new correlation ID (UUID4 format)
     """
-    correlation_id = str(uuid.uuid4())
+    # Same layout as str(uuid.uuid4()) without building a UUID object
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.hex()
+    correlation_id = f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
     _correlation_id_var.set(correlation_id)
     return correlation_id
 
@@ -56,9 +94,7 @@ def new_agent_id() -> str:
     Returns:
         str: Agent ID in format "agt-<12hex>"
     """
-    # Generate UUID4 and take first 12 hex characters
-    hex_part = uuid.uuid4().hex[:12]
-    return f"agt-{hex_part}"
+    return _AGT + _next_hex_id()
 
 
 def new_step_id() -> str:
@@ -68,9 +104,7 @@ def new_step_id() -> str:
     Returns:
         str: Step ID in format "stp-<12hex>"
     """
-    # Generate UUID4 and take first 12 hex characters
-    hex_part = uuid.uuid4().hex[:12]
-    return f"stp-{hex_part}"
+    return _STP + _next_hex_id()
 
 
 def ensure_correlation_id() -> str:
@@ -81,10 +115,10 @@ def ensure_correlation_id() -> str:
     Returns:
         str: The current or newly created correlation ID
     """
-    correlation_id = get_correlation_id()
-    if correlation_id is None:
-        correlation_id = new_correlation_id()
-    return correlation_id 
+    correlation_id = _correlation_id_var.get()
+    if correlation_id is not None:
+        return correlation_id
+    return new_correlation_id() 
 
 
 # Convenient aliases for common usage patterns
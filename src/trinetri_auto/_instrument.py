@@ -22,6 +22,7 @@ of LLM clients, frameworks, and protocols when trinetri_auto is imported.
 import warnings
 
 from ._ids import ensure_correlation_id
+from ._status import get_patch_status
 from .agent import instrument_agent
 from .eval import score_with
 
@@ -40,63 +41,6 @@ from ._protocol.a2a import patch_a2a
 __all__ = ["instrument_agent", "score_with", "get_patch_status"]
 
 
-def get_patch_status() -> dict:
-    """
-    Get the current patching status for all components.
-    
-    Returns:
-        dict: Status of all patches with bool values
-    """
-    status = {}
-    
-    # Check LLM clients
-    try:
-        from ._llm.openai import patch_openai
-        status["OpenAI"] = patch_openai.__wrapped__ is not None if hasattr(patch_openai, '__wrapped__') else True
-    except (ImportError, AttributeError):
-        status["OpenAI"] = False
-    
-    try:
-        from ._llm.anthropic import patch_anthropic  
-        status["Anthropic"] = patch_anthropic.__wrapped__ is not None if hasattr(patch_anthropic, '__wrapped__') else True
-    except (ImportError, AttributeError):
-        status["Anthropic"] = False
-    
-    try:
-        from ._llm.httpx import patch_httpx
-        status["HTTPX"] = patch_httpx.__wrapped__ is not None if hasattr(patch_httpx, '__wrapped__') else True
-    except (ImportError, AttributeError):
-        status["HTTPX"] = False
-        
-    # Check frameworks
-    try:
-        from ._framework.langgraph import instrument_langgraph
-        status["LangGraph"] = instrument_langgraph.__wrapped__ is not None if hasattr(instrument_langgraph, '__wrapped__') else True
-    except (ImportError, AttributeError):
-        status["LangGraph"] = False
-        
-    try:
-        from ._framework.crewai import instrument_crewai
-        status["CrewAI"] = instrument_crewai.__wrapped__ is not None if hasattr(instrument_crewai, '__wrapped__') else True
-    except (ImportError, AttributeError):
-        status["CrewAI"] = False
-    
-    # Check protocols
-    try:
-        from ._protocol.mcp import patch_mcp
-        status["MCP"] = patch_mcp.__wrapped__ is not None if hasattr(patch_mcp, '__wrapped__') else True
-    except (ImportError, AttributeError):
-        status["MCP"] = False
-        
-    try:
-        from ._protocol.a2a import patch_a2a
-        status["A2A"] = patch_a2a.__wrapped__ is not None if hasattr(patch_a2a, '__wrapped__') else True
-    except (ImportError, AttributeError):
-        status["A2A"] = False
-    
-    return status
-
-
 def _apply_auto_patching() -> None:
     """
     Apply automatic patching to available libraries.
@@ -24,6 +24,7 @@ from typing import Any, Dict, Optional, Union, List
 import json
 import time
 from .._ids import get_correlation_id, new_step_id
+from .._status import set_patch_status
 
 try:
     import anthropic
@@ -33,6 +34,8 @@ try:
 except ImportError:
     ANTHROPIC_AVAILABLE = False
 
+tracer = trace.get_tracer("trinetri.anthropic")
+
 
 def patch_anthropic() -> bool:
     """Patch Anthropic client to emit spans with token usage and latency."""
@@ -48,7 +51,7 @@ def patch_anthropic() -> bool:
             correlation_id = get_correlation_id()
             step_id = new_step_id()
             
-            with trace.get_tracer("trinetri.anthropic").start_as_current_span(
+            with tracer.start_as_current_span(
                 "llm.anthropic.messages.create",
                 attributes={
                     "agent.correlation_id": correlation_id,
@@ -152,7 +155,7 @@ def patch_anthropic() -> bool:
                 correlation_id = get_correlation_id()
                 step_id = new_step_id()
                 
-                with trace.get_tracer("trinetri.anthropic").start_as_current_span(
+                with tracer.start_as_current_span(
                     "llm.anthropic.messages.acreate",
                     attributes={
                         "agent.correlation_id": correlation_id,
@@ -253,6 +256,7 @@ def patch_anthropic() -> bool:
         # Apply the sync patch
         messages.Messages.create = patched_create
         
+        set_patch_status("Anthropic", True)
         return True
         
     except Exception:
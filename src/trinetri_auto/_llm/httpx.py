@@ -25,6 +25,7 @@ import json
 import time
 from urllib.parse import urlparse
 from .._ids import get_correlation_id, new_step_id
+from .._status import set_patch_status
 
 try:
     import httpx
@@ -32,6 +33,8 @@ try:
 except ImportError:
     HTTPX_AVAILABLE = False
 
+tracer = trace.get_tracer("trinetri.httpx")
+
 # Known LLM API hosts that we want to instrument
 LLM_HOSTS = {
     'api.openai.com',
@@ -84,7 +87,7 @@ def patch_httpx() -> bool:
             correlation_id = get_correlation_id()
             step_id = new_step_id()
             
-            with trace.get_tracer("trinetri.httpx").start_as_current_span(
+            with tracer.start_as_current_span(
                 f"llm.http.{method.lower()}",
                 attributes={
                     "agent.correlation_id": correlation_id,
@@ -230,7 +233,7 @@ def patch_httpx() -> bool:
             correlation_id = get_correlation_id()
             step_id = new_step_id()
             
-            with trace.get_tracer("trinetri.httpx").start_as_current_span(
+            with tracer.start_as_current_span(
                 f"llm.http.{method.lower()}",
                 attributes={
                     "agent.correlation_id": correlation_id,
@@ -360,6 +363,7 @@ def patch_httpx() -> bool:
         httpx.Client.request = patched_request
         httpx.AsyncClient.request = patched_async_request
         
+        set_patch_status("HTTPX", True)
         return True
         
     except Exception:
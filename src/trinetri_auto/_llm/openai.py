@@ -24,6 +24,7 @@ from typing import Any, Dict, Optional, Union
 import json
 import time
 from .._ids import get_correlation_id, new_step_id
+from .._status import set_patch_status
 
 try:
     import openai
@@ -33,12 +34,25 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
+tracer = trace.get_tracer("trinetri.openai")
+
+# Shared status for successful spans; Status is immutable so one instance suffices
+_STATUS_OK = Status(StatusCode.OK)
+
+# Tracks whether the chat completions methods are currently wrapped
+_PATCHED = False
+
 
 def patch_openai() -> bool:
     """Patch OpenAI client to emit spans with token usage and latency."""
+    global _PATCHED
     if not OPENAI_AVAILABLE:
         return False
     
+    if _PATCHED:
+        # Already wrapped; avoid stacking wrappers on repeated calls
+        return True
+    
     try:
         # Patch synchronous chat completions
         original_create = completions.Completions.create
@@ -48,7 +62,7 @@ def patch_openai() -> bool:
             correlation_id = get_correlation_id()
             step_id = new_step_id()
             
-            with trace.get_tracer("trinetri.openai").start_as_current_span(
+            with tracer.start_as_current_span(
                 "llm.openai.chat.completions.create",
                 attributes={
                     "agent.correlation_id": correlation_id,
@@ -108,7 +122,7 @@ def patch_openai() -> bool:
                     if hasattr(response, 'model'):
                         span.set_attribute("llm.response_model", response.model)
                     
-                    span.set_status(Status(StatusCode.OK))
+                    span.set_status(_STATUS_OK)
                     return response
                     
                 except Exception as e:
@@ -126,7 +140,7 @@ def patch_openai() -> bool:
                 correlation_id = get_correlation_id()
                 step_id = new_step_id()
                 
-                with trace.get_tracer("trinetri.openai").start_as_current_span(
+                with tracer.start_as_current_span(
                     "llm.openai.chat.completions.acreate",
                     attributes={
                         "agent.correlation_id": correlation_id,
@@ -186,7 +200,7 @@ def patch_openai() -> bool:
                         if hasattr(response, 'model'):
                             span.set_attribute("llm.response_model", response.model)
                         
-                        span.set_status(Status(StatusCode.OK))
+                        span.set_status(_STATUS_OK)
                         return response
                         
                     except Exception as e:
@@ -195,11 +209,15 @@ def patch_openai() -> bool:
                         span.set_attribute("error.message", str(e))
                         raise
             
+            patched_async_create._trinetri_original = original_async_create
             completions.AsyncCompletions.create = patched_async_create
         
         # Apply the sync patch
+        patched_create._trinetri_original = original_create
         completions.Completions.create = patched_create
         
+        _PATCHED = True
+        set_patch_status("OpenAI", True)
         return True
         
     except Exception:
@@ -229,7 +247,24 @@ def unpatch_openai() -> None:
     """
     Remove OpenAI patches.
     
-    Raises:
-        NotImplementedError: This is a Phase 1 stub
+    Restores the original chat completions methods stored on the wrappers
+    by patch_openai(). Safe to call when OpenAI is unavailable or unpatched.
     """
-    raise NotImplementedError("OpenAI unpatching not yet implemented in Phase 1") 
\ No newline at end of file
+    global _PATCHED
+    if not OPENAI_AVAILABLE or not _PATCHED:
+        return
+    
+    original_create = getattr(completions.Completions.create, "_trinetri_original", None)
+    if original_create is not None:
+        completions.Completions.create = original_create
+    
+    if hasattr(completions, 'AsyncCompletions'):
+        original_async_create = getattr(
+            completions.AsyncCompletions.create, "_trinetri_original", None
+        )
+        if original_async_create is not None:
+            completions.AsyncCompletions.create = original_async_create
+    
+    _PATCHED = False
+    set_patch_status("OpenAI", False)
+
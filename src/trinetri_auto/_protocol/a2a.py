@@ -18,6 +18,16 @@ Patches AWS A2A thread interactions to emit OTEL spans with thread tracking.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib.util
+
+# TODO: Determine the correct AWS A2A import path
+# This might be part of boto3 or a separate AWS SDK
+# The stub never uses the package, so only check that it is installed
+try:
+    A2A_AVAILABLE = importlib.util.find_spec("boto3") is not None
+except (ImportError, ValueError):
+    A2A_AVAILABLE = False
+
 
 def patch_a2a() -> bool:
     """
@@ -25,31 +35,22 @@ def patch_a2a() -> bool:
     
     Returns:
         bool: True if patching was successful, False if A2A not available
-        
-    Raises:
-        NotImplementedError: This is a Phase 1 stub
+            or not yet supported (Phase 1 stub)
     """
-    try:
-        # TODO: Determine the correct AWS A2A import path
-        # This might be part of boto3 or a separate AWS SDK
-        # import boto3  # noqa: F401
-        
-        # TODO: Implement actual A2A patching
-        # - Track A2A thread IDs
-        # - Wrap agent communication operations
-        # - Add a2a.thread_id to universal attributes
-        # - Track message exchanges between agents
-        raise NotImplementedError("AWS A2A patching not yet implemented in Phase 1")
-    except ImportError:
-        # A2A not available, skip patching
+    if not A2A_AVAILABLE:
         return False
+    
+    # TODO: Implement actual A2A patching
+    # - Track A2A thread IDs
+    # - Wrap agent communication operations
+    # - Add a2a.thread_id to universal attributes
+    # - Track message exchanges between agents
+    return False
 
 
 def unpatch_a2a() -> None:
     """
     Remove A2A patches.
     
-    Raises:
-        NotImplementedError: This is a Phase 1 stub
+    patch_a2a() does not apply any patches yet, so there is nothing to undo.
     """
-    raise NotImplementedError("AWS A2A unpatching not yet implemented in Phase 1") 
\ No newline at end of file
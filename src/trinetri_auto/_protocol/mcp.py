@@ -18,6 +18,16 @@ Patches MCP message exchanges to emit OTEL spans with context tracking.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib.util
+
+# TODO: Determine the correct MCP import path
+# This might be part of anthropic client or a separate package
+# The stub never uses the package, so only check that it is installed
+try:
+    MCP_AVAILABLE = importlib.util.find_spec("mcp") is not None
+except (ImportError, ValueError):
+    MCP_AVAILABLE = False
+
 
 def patch_mcp() -> bool:
     """
@@ -25,31 +35,22 @@ def patch_mcp() -> bool:
     
     Returns:
         bool: True if patching was successful, False if MCP not available
-        
-    Raises:
-        NotImplementedError: This is a Phase 1 stub
+            or not yet supported (Phase 1 stub)
     """
-    try:
-        # TODO: Determine the correct MCP import path
-        # This might be part of anthropic client or a separate package
-        # import mcp  # noqa: F401
-        
-        # TODO: Implement actual MCP patching
-        # - Track MCP context IDs
-        # - Wrap message send/receive operations
-        # - Add mcp.context_id to universal attributes
-        # - Track tool calls and responses
-        raise NotImplementedError("MCP patching not yet implemented in Phase 1")
-    except ImportError:
-        # MCP not available, skip patching
+    if not MCP_AVAILABLE:
         return False
+    
+    # TODO: Implement actual MCP patching
+    # - Track MCP context IDs
+    # - Wrap message send/receive operations
+    # - Add mcp.context_id to universal attributes
+    # - Track tool calls and responses
+    return False
 
 
 def unpatch_mcp() -> None:
     """
     Remove MCP patches.
     
-    Raises:
-        NotImplementedError: This is a Phase 1 stub
+    patch_mcp() does not apply any patches yet, so there is nothing to undo.
     """
-    raise NotImplementedError("MCP unpatching not yet implemented in Phase 1") 
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Patch status registry for Trinetri.
+
+Patchers record whether their instrumentation is currently applied, so the
+reported status stays correct after manual patch or unpatch calls.
+"""
+
+# Copyright 2025 Trinetri Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+# Whether each component's instrumentation is currently applied
+_PATCH_STATUS: Dict[str, bool] = {
+    name: False
+    for name in ("OpenAI", "Anthropic", "HTTPX", "LangGraph", "CrewAI", "MCP", "A2A")
+}
+
+
+def set_patch_status(component: str, patched: bool) -> None:
+    """
+    Record whether a component's instrumentation is applied.
+    
+    Args:
+        component: Component name as reported by get_patch_status (e.g. "OpenAI")
+        patched: True once patched, False after unpatching
+    """
+    _PATCH_STATUS[component] = patched
+
+
+def get_patch_status() -> Dict[str, bool]:
+    """
+    Get the current patching status for all components.
+    
+    Returns:
+        dict: Copy of the status of all patches with bool values
+    """
+    return _PATCH_STATUS.copy()
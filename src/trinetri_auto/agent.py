@@ -19,9 +19,7 @@ with OpenTelemetry spans and universal correlation attributes.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import functools
-import inspect
-from typing import Any, Callable, Type, TypeVar
+from typing import Any, Type, TypeVar
 
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
@@ -32,6 +30,9 @@ T = TypeVar("T")
 
 tracer = trace.get_tracer(__name__)
 
+# Status objects are immutable, so every successful agent span shares one
+_STATUS_OK = Status(StatusCode.OK)
+
 
 def instrument_agent(cls: Type[T], role: str) -> Type[T]:
     """
@@ -39,6 +40,8 @@ def instrument_agent(cls: Type[T], role: str) -> Type[T]:
     
     Monkey-patches the class to wrap method calls in OTEL spans
     with universal attributes like agent.correlation_id, agent.role, etc.
+    The ``run`` method is wrapped, else ``act``, else the first public
+    method defined on the class (or, failing that, on its nearest base).
     
     Args:
         cls: The agent class to instrument
@@ -54,15 +57,17 @@ def instrument_agent(cls: Type[T], role: str) -> Type[T]:
     elif hasattr(cls, "act") and callable(getattr(cls, "act")):
         method_to_wrap = "act"
     else:
-        # If neither run nor act exists, wrap the first public method found
-        for attr_name in dir(cls):
-            attr_value = getattr(cls, attr_name)
-            if (
-                not attr_name.startswith("_")
-                and callable(attr_value)
-                and not inspect.isbuiltin(attr_value)
-            ):
-                method_to_wrap = attr_name
+        # If neither run nor act exists, wrap the first public method in
+        # definition order, searching the class itself before its bases (so
+        # not the alphabetical order dir() would give). Only user-defined
+        # class dicts are scanned (skipping ``object``), so no builtin
+        # attributes need to be filtered out.
+        for klass in cls.__mro__[:-1]:
+            for attr_name, attr_value in vars(klass).items():
+                if not attr_name.startswith("_") and callable(attr_value):
+                    method_to_wrap = attr_name
+                    break
+            if method_to_wrap is not None:
                 break
     
     if method_to_wrap is None:
@@ -72,7 +77,9 @@ def instrument_agent(cls: Type[T], role: str) -> Type[T]:
     # Get the original method
     original_method = getattr(cls, method_to_wrap)
     
-    @functools.wraps(original_method)
+    span_name = f"{cls.__name__}.{method_to_wrap}"
+    class_name = cls.__name__
+    
     def wrapped_method(self: Any, *args: Any, **kwargs: Any) -> Any:
         """Wrapped method with OpenTelemetry instrumentation."""
         # Ensure correlation ID exists
@@ -80,16 +87,13 @@ def instrument_agent(cls: Type[T], role: str) -> Type[T]:
         agent_id = new_agent_id()
         step_id = new_step_id()
         
-        # Create span name
-        span_name = f"{cls.__name__}.{method_to_wrap}"
-        
         with tracer.start_as_current_span(span_name) as span:
             # Set universal attributes
             span.set_attribute("agent.correlation_id", correlation_id)
             span.set_attribute("agent.role", role)
             span.set_attribute("agent.id", agent_id)
             span.set_attribute("step.id", step_id)
-            span.set_attribute("agent.class_name", cls.__name__)
+            span.set_attribute("agent.class_name", class_name)
             span.set_attribute("agent.method_name", method_to_wrap)
             span.set_attribute("span.type", "agent")
             
@@ -98,7 +102,7 @@ def instrument_agent(cls: Type[T], role: str) -> Type[T]:
                 result = original_method(self, *args, **kwargs)
                 
                 # Mark span as successful
-                span.set_status(Status(StatusCode.OK))
+                span.set_status(_STATUS_OK)
                 
                 return result
                 
@@ -108,6 +112,13 @@ def instrument_agent(cls: Type[T], role: str) -> Type[T]:
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 raise
     
+    # Copy identity attributes by hand; skipping __wrapped__ keeps
+    # inspect.signature() from unwrapping on every introspection
+    wrapped_method.__name__ = original_method.__name__
+    wrapped_method.__qualname__ = original_method.__qualname__
+    wrapped_method.__doc__ = original_method.__doc__
+    wrapped_method.__module__ = getattr(original_method, "__module__", None)
+    
     # Replace the original method with the wrapped version
     setattr(cls, method_to_wrap, wrapped_method)
     
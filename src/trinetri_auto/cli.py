@@ -18,18 +18,18 @@ Provides health checking, dynamic instrumentation, and diagnostic tools.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import os
 import sys
 import time
 import importlib
-import urllib.request
-import urllib.error
-from typing import Optional, Tuple, Any
+import importlib.util
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import click
 
-from .agent import instrument_agent
-from ._instrument import get_patch_status
+# urllib, the agent module and the patch registry are imported inside the
+# functions that use them rather than when the CLI module loads.
 
 
 # ANSI color codes for terminal output
@@ -44,48 +44,74 @@ class Colors:
     END = '\033[0m'
 
 
+def _status_format(symbol: str, color: str, status: str) -> Tuple[str, str]:
+    """Build the (prefix, suffix) that print_status wraps around a message."""
+    return (f"{symbol} {Colors.BOLD}", f"{Colors.END}: {color}{status}{Colors.END}")
+
+
+# Pre-rendered prefixes/suffixes for the known status levels
+_STATUS_FORMATS = {
+    "OK": _status_format("✅", Colors.GREEN, "OK"),
+    "WARN": _status_format("⚠️ ", Colors.YELLOW, "WARN"),
+    "FAIL": _status_format("❌", Colors.RED, "FAIL"),
+    "INFO": _status_format("ℹ️ ", Colors.BLUE, "INFO"),
+}
+
+_DETAILS_PREFIX = f"   {Colors.CYAN}"
+
+
 def print_status(message: str, status: str, details: str = "") -> None:
     """Print a formatted status message with color coding."""
-    if status == "OK":
-        status_color = Colors.GREEN
-        status_symbol = "✅"
-    elif status == "WARN":
-        status_color = Colors.YELLOW
-        status_symbol = "⚠️ "
-    elif status == "FAIL":
-        status_color = Colors.RED
-        status_symbol = "❌"
-    else:
-        status_color = Colors.BLUE
-        status_symbol = "ℹ️ "
+    fmt = _STATUS_FORMATS.get(status)
+    if fmt is None:
+        # Unknown levels render like INFO but keep their own label
+        fmt = _status_format("ℹ️ ", Colors.BLUE, status)
+    prefix, suffix = fmt
     
-    click.echo(f"{status_symbol} {Colors.BOLD}{message}{Colors.END}: "
-               f"{status_color}{status}{Colors.END}")
+    click.echo(f"{prefix}{message}{suffix}")
     if details:
-        click.echo(f"   {Colors.CYAN}{details}{Colors.END}")
+        click.echo(f"{_DETAILS_PREFIX}{details}{Colors.END}")
+
+
+# Environment variables inspected by `doctor`, with human-readable descriptions
+REQUIRED_ENV_VARS = {
+    "OTEL_EXPORTER_OTLP_ENDPOINT": "OpenTelemetry endpoint",
+    "OTEL_SERVICE_NAME": "Service identification"
+}
+
+OPTIONAL_ENV_VARS = {
+    "OTEL_EXPORTER_OTLP_HEADERS": "Authentication headers",
+    "OTEL_RESOURCE_ATTRIBUTES": "Resource metadata",
+    "OTEL_EXPORTER_OTLP_PROTOCOL": "Protocol specification",
+    "TRINETRI_CORRELATION_PREFIX": "Custom correlation ID prefix"
+}
+
+# Snapshot of the variables above, captured once per `doctor` run and shared
+# by all checks. None outside a run, in which case os.environ is read directly.
+_ENV_SNAPSHOT: Optional[Dict[str, Optional[str]]] = None
+
+
+def _snapshot_environment() -> Dict[str, Optional[str]]:
+    """Capture the doctor-relevant environment variables in one pass."""
+    env = os.environ
+    return {var: env.get(var) for var in (*REQUIRED_ENV_VARS, *OPTIONAL_ENV_VARS)}
+
+
+def _environ() -> Mapping[str, Optional[str]]:
+    """Return the active environment snapshot, or os.environ outside doctor."""
+    return os.environ if _ENV_SNAPSHOT is None else _ENV_SNAPSHOT
 
 
 def check_environment_variables() -> bool:
     """Check for required and recommended environment variables."""
     print_status("Environment Variables", "INFO", "Checking OTLP configuration...")
     
-    required_vars = {
-        "OTEL_EXPORTER_OTLP_ENDPOINT": "OpenTelemetry endpoint",
-        "OTEL_SERVICE_NAME": "Service identification"
-    }
-    
-    optional_vars = {
-        "OTEL_EXPORTER_OTLP_HEADERS": "Authentication headers",
-        "OTEL_RESOURCE_ATTRIBUTES": "Resource metadata",
-        "OTEL_EXPORTER_OTLP_PROTOCOL": "Protocol specification",
-        "TRINETRI_CORRELATION_PREFIX": "Custom correlation ID prefix"
-    }
-    
+    env = _environ()
     all_good = True
     
     # Check required variables
-    for var, description in required_vars.items():
-        value = os.getenv(var)
+    for var, description in REQUIRED_ENV_VARS.items():
+        value = env.get(var)
         if value:
             print_status(f"  {var}", "OK", f"{description}: {value}")
         else:
@@ -93,8 +119,8 @@ def check_environment_variables() -> bool:
             all_good = False
     
     # Check optional variables
-    for var, description in optional_vars.items():
-        value = os.getenv(var)
+    for var, description in OPTIONAL_ENV_VARS.items():
+        value = env.get(var)
         if value:
             print_status(f"  {var}", "OK", f"{description}: {value}")
         else:
@@ -103,9 +129,42 @@ def check_environment_variables() -> bool:
     return all_good
 
 
+@functools.lru_cache(maxsize=4)
+def _build_health_url(endpoint: str) -> str:
+    """
+    Derive the health check URL for an OTLP endpoint.
+    
+    Args:
+        endpoint: Value of OTEL_EXPORTER_OTLP_ENDPOINT
+        
+    Returns:
+        The URL to probe, keeping any query string from the endpoint
+        
+    Raises:
+        ValueError: If the endpoint is not an http(s) URL with a host
+    """
+    import urllib.parse
+    
+    parts = urllib.parse.urlsplit(endpoint)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"expected an http(s) URL, got '{endpoint}'")
+    
+    if parts.path.endswith("/v1/traces"):
+        path = parts.path[:-len("/v1/traces")] + "/health"
+    elif parts.path.endswith("/"):
+        path = f"{parts.path}v1/traces"
+    else:
+        path = f"{parts.path}/v1/traces"
+    
+    return parts._replace(path=path, fragment="").geturl()
+
+
 def check_otlp_endpoint() -> bool:
     """Check if OTLP endpoint is reachable."""
-    endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    import urllib.error
+    import urllib.request
+    
+    endpoint = _environ().get("OTEL_EXPORTER_OTLP_ENDPOINT")
     if not endpoint:
         print_status("OTLP Endpoint Connectivity", "FAIL", 
                     "No OTEL_EXPORTER_OTLP_ENDPOINT configured")
@@ -113,12 +172,7 @@ def check_otlp_endpoint() -> bool:
     
     # Parse endpoint and construct health check URL
     try:
-        if endpoint.endswith("/v1/traces"):
-            health_url = endpoint.replace("/v1/traces", "/health")
-        elif endpoint.endswith("/"):
-            health_url = f"{endpoint}v1/traces"
-        else:
-            health_url = f"{endpoint}/v1/traces"
+        health_url = _build_health_url(endpoint)
         
         print_status("OTLP Endpoint Connectivity", "INFO", 
                     f"Testing connection to {endpoint}...")
@@ -169,42 +223,67 @@ def check_otlp_endpoint() -> bool:
         return False
 
 
-def check_dependencies() -> bool:
-    """Check if required dependencies are available."""
+def _is_importable(module_name: str) -> bool:
+    """
+    Check whether a module can be imported without executing it.
+    
+    Uses importlib.util.find_spec, which only runs parent package
+    __init__ files for dotted names.
+    """
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # Parent package missing or broken
+        return False
+
+
+def check_dependencies(found: Optional[Dict[str, bool]] = None) -> bool:
+    """
+    Check if required dependencies are available.
+    
+    Args:
+        found: Optional dict to fill with each probed module name and whether
+            it is importable, so later checks can reuse the results
+    """
     print_status("Dependencies", "INFO", "Checking Python packages...")
     
+    # (distribution name, import name, description)
     required_deps = [
-        ("opentelemetry-api", "OpenTelemetry API"),
-        ("opentelemetry-sdk", "OpenTelemetry SDK"),
-        ("opentelemetry-exporter-otlp", "OTLP Exporter")
+        ("opentelemetry-api", "opentelemetry.trace", "OpenTelemetry API"),
+        ("opentelemetry-sdk", "opentelemetry.sdk", "OpenTelemetry SDK"),
+        ("opentelemetry-exporter-otlp", "opentelemetry.exporter.otlp", "OTLP Exporter")
     ]
     
     optional_deps = [
-        ("deepeval", "DeepEval evaluation framework"),
-        ("langgraph", "LangGraph framework"),
-        ("crewai", "CrewAI framework"),
-        ("openai", "OpenAI client"),
-        ("anthropic", "Anthropic client"),
-        ("httpx", "HTTP client")
+        ("deepeval", "deepeval", "DeepEval evaluation framework"),
+        ("langgraph", "langgraph", "LangGraph framework"),
+        ("crewai", "crewai", "CrewAI framework"),
+        ("openai", "openai", "OpenAI client"),
+        ("anthropic", "anthropic", "Anthropic client"),
+        ("httpx", "httpx", "HTTP client")
     ]
     
     all_good = True
     
     # Check required dependencies
-    for package, description in required_deps:
-        try:
-            importlib.import_module(package.replace("-", "_"))
+    for package, module_name, description in required_deps:
+        importable = _is_importable(module_name)
+        if found is not None:
+            found[module_name] = importable
+        if importable:
             print_status(f"  {package}", "OK", description)
-        except ImportError:
+        else:
             print_status(f"  {package}", "FAIL", f"Missing {description}")
             all_good = False
     
     # Check optional dependencies
-    for package, description in optional_deps:
-        try:
-            importlib.import_module(package)
+    for package, module_name, description in optional_deps:
+        importable = _is_importable(module_name)
+        if found is not None:
+            found[module_name] = importable
+        if importable:
             print_status(f"  {package}", "OK", description)
-        except ImportError:
+        else:
             print_status(f"  {package}", "WARN", f"Optional {description} not available")
     
     return all_good
@@ -214,6 +293,8 @@ def check_instrumentation_status() -> bool:
     """Check current instrumentation patch status."""
     print_status("Instrumentation Status", "INFO", "Checking patch applications...")
     
+    from ._instrument import get_patch_status
+    
     try:
         status = get_patch_status()
         all_patches_ok = True
@@ -232,6 +313,7 @@ def check_instrumentation_status() -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=128)
 def import_class_from_string(module_class_path: str) -> Tuple[Any, str]:
     """
     Import a class from a module:Class string.
@@ -270,30 +352,49 @@ def doctor(verbose: bool):
     """
     Run comprehensive health checks for Trinetri configuration.
     
-    Checks environment variables, OTLP endpoint reachability,
-    dependencies, and instrumentation status.
+    Checks dependencies, environment variables, OTLP endpoint
+    reachability, and instrumentation status.
     """
+    global _ENV_SNAPSHOT
     click.echo(f"\n{Colors.BOLD}{Colors.BLUE}🔍 Trinetri Doctor - Health Check{Colors.END}\n")
     
+    # Read the environment once for all checks; cleared on exit (incl. sys.exit)
+    _ENV_SNAPSHOT = _snapshot_environment()
+    try:
+        _run_doctor(verbose)
+    finally:
+        _ENV_SNAPSHOT = None
+
+
+def _run_doctor(verbose: bool) -> None:
+    """Run the doctor checks and exit with the overall result."""
+    # Import probes from the dependency check, reused by later checks
+    found: Dict[str, bool] = {}
     checks = [
+        ("Dependencies", functools.partial(check_dependencies, found)),
         ("Environment Variables", check_environment_variables),
-        ("Dependencies", check_dependencies),
         ("OTLP Connectivity", check_otlp_endpoint),
         ("Instrumentation Status", check_instrumentation_status)
     ]
     
-    results = []
+    results: Dict[str, bool] = {}
     for check_name, check_func in checks:
+        if (check_func is check_otlp_endpoint and not results.get("Dependencies", True)
+                and not found.get("opentelemetry.exporter.otlp", True)):
+            # Without the exporter nothing can be sent; don't wait on the probe
+            print_status("OTLP Endpoint Connectivity", "FAIL",
+                        "Skipped: OTLP exporter not installed")
+            results[check_name] = False
+            continue
         try:
-            result = check_func()
-            results.append((check_name, result))
+            results[check_name] = check_func()
         except Exception as e:
             print_status(check_name, "FAIL", f"Unexpected error: {str(e)}")
-            results.append((check_name, False))
+            results[check_name] = False
     
     # Summary
     click.echo(f"\n{Colors.BOLD}📋 Health Check Summary{Colors.END}")
-    passed = sum(1 for _, result in results if result)
+    passed = sum(1 for result in results.values() if result)
     total = len(results)
     
     if passed == total:
@@ -361,6 +462,7 @@ def instrument(module_class: str, role: str, dry_run: bool, verbose: bool):
         print_status("Instrumentation", "INFO", "Applying agent instrumentation...")
         start_time = time.time()
         
+        from .agent import instrument_agent
         instrument_agent(agent_class, role=role)
         
         duration = int((time.time() - start_time) * 1000)
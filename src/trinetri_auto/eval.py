@@ -20,13 +20,17 @@ during function execution with threshold-based gating.
 # limitations under the License.
 
 import functools
+import os
 import time
-from typing import Any, Callable, Optional
+from typing import Any, Callable, List, Optional, Tuple
 
 from opentelemetry import trace
-from opentelemetry.trace import Status, StatusCode
+from opentelemetry.trace import Link, Status, StatusCode
 
 from ._ids import new_step_id, ensure_correlation_id
+from .worker import EvaluationTask, get_evaluation_queue
+
+tracer = trace.get_tracer(__name__)
 
 
 class EvaluationError(Exception):
@@ -44,6 +48,42 @@ def _mock_deepeval_score() -> float:
     return 0.82
 
 
+# DeepEval classes (GEval, LLMTestCase, LLMTestCaseParams), resolved on first use
+_DEEPEVAL: Optional[Tuple[Any, Any, Any]] = None
+_DEEPEVAL_TRIED = False
+
+
+def _get_deepeval() -> Optional[Tuple[Any, Any, Any]]:
+    """
+    Import DeepEval once and cache the classes needed for G-Eval.
+    
+    Returns:
+        (GEval, LLMTestCase, LLMTestCaseParams), or None if DeepEval is unavailable
+    """
+    global _DEEPEVAL, _DEEPEVAL_TRIED
+    if not _DEEPEVAL_TRIED:
+        try:
+            from deepeval.metrics import GEval
+            from deepeval.test_case import LLMTestCase, LLMTestCaseParams
+            _DEEPEVAL = (GEval, LLMTestCase, LLMTestCaseParams)
+        except Exception:
+            # Missing or broken install; never let it reach the decorated call
+            _DEEPEVAL = None
+        _DEEPEVAL_TRIED = True
+    return _DEEPEVAL
+
+
+def _build_geval(GEval: Any, LLMTestCaseParams: Any) -> Any:
+    """Construct the G-Eval metric used for response quality scoring."""
+    return GEval(
+        name="Response Quality",
+        criteria="Evaluate the quality, relevance, and appropriateness of the actual output based on the input.",
+        evaluation_params=[LLMTestCaseParams.INPUT, LLMTestCaseParams.ACTUAL_OUTPUT],
+        threshold=0.0,  # We handle thresholding in the decorator
+        strict_mode=False
+    )
+
+
 def _compute_deepeval_score(
     input_text: str,
     actual_output: str,
@@ -62,43 +102,81 @@ def _compute_deepeval_score(
     Returns:
         Evaluation score between 0.0 and 1.0
     """
+    deepeval = _get_deepeval()
+    if deepeval is None or metric != "g-eval":
+        # DeepEval not available or unsupported metric, use mock
+        return _mock_deepeval_score()
+    
+    GEval, LLMTestCase, LLMTestCaseParams = deepeval
     try:
-        # Try to import and use DeepEval
-        from deepeval.metrics import GEval
-        from deepeval.test_case import LLMTestCase, LLMTestCaseParams
-        
         # Create G-Eval metric
-        if metric == "g-eval":
-            eval_metric = GEval(
-                name="Response Quality",
-                criteria="Evaluate the quality, relevance, and appropriateness of the actual output based on the input.",
-                evaluation_params=[LLMTestCaseParams.INPUT, LLMTestCaseParams.ACTUAL_OUTPUT],
-                threshold=0.0,  # We handle thresholding in the decorator
-                strict_mode=False
-            )
-            
-            # Create test case
-            test_case = LLMTestCase(
-                input=str(input_text),
-                actual_output=str(actual_output),
-                expected_output=expected_output
-            )
-            
-            # Run evaluation
-            eval_metric.measure(test_case)
-            return eval_metric.score
-        else:
-            # Fallback for unsupported metrics
-            return _mock_deepeval_score()
-            
-    except ImportError:
-        # DeepEval not available, use mock
-        return _mock_deepeval_score()
+        eval_metric = _build_geval(GEval, LLMTestCaseParams)
+        
+        # Create test case
+        test_case = LLMTestCase(
+            input=str(input_text),
+            actual_output=str(actual_output),
+            expected_output=expected_output
+        )
+        
+        # Run evaluation
+        eval_metric.measure(test_case)
+        return eval_metric.score
+        
     except Exception:
         # Any other error, use mock
         return _mock_deepeval_score()
 
 
+def _compute_deepeval_scores(
+    cases: List[Tuple[str, str]],
+    metric: str = "g-eval"
+) -> List[float]:
+    """
+    Score a batch of (input, output) pairs with a single metric instance.
+    
+    Building the G-Eval metric (and its model client) once per batch avoids
+    repeating that setup for every case.
+    
+    Args:
+        cases: (input_text, actual_output) pairs to evaluate
+        metric: Evaluation metric to use (currently supports "g-eval")
+        
+    Returns:
+        One score between 0.0 and 1.0 per case, in order
+    """
+    deepeval = _get_deepeval()
+    if deepeval is None or metric != "g-eval":
+        return [_mock_deepeval_score() for _ in cases]
+    
+    GEval, LLMTestCase, LLMTestCaseParams = deepeval
+    try:
+        eval_metric = _build_geval(GEval, LLMTestCaseParams)
+    except Exception:
+        return [_mock_deepeval_score() for _ in cases]
+    
+    scores = []
+    for input_text, actual_output in cases:
+        try:
+            eval_metric.measure(LLMTestCase(input=input_text, actual_output=actual_output))
+            scores.append(eval_metric.score)
+        except Exception:
+            # Score failures individually so one bad case doesn't sink the batch
+            scores.append(_mock_deepeval_score())
+    return scores
+
+
+def _extract_input(args: tuple, kwargs: dict) -> str:
+    """Extract evaluation input: first positional arg, else 'input'/'query' kwargs."""
+    if args:
+        return str(args[0])
+    elif 'input' in kwargs:
+        return str(kwargs['input'])
+    elif 'query' in kwargs:
+        return str(kwargs['query'])
+    return ""
+
+
 def score_with(metric = "g-eval", threshold: float = 0.8):
     """
     Decorator for in-trace evaluation of function outputs.
@@ -107,6 +185,12 @@ def score_with(metric = "g-eval", threshold: float = 0.8):
     and emits a child span with evaluation results. If the score falls below
     the threshold, raises EvaluationError to gate execution.
     
+    When TRINETRI_EVAL_ASYNC=1 is set at decoration time and a DeepEval
+    (string) metric is used, scoring is handed to the evaluation worker
+    queue instead of running inline. The evaluation span is then marked
+    pending, the worker emits a linked result span, and the threshold is
+    advisory only. Without a running worker, scoring falls back to inline.
+    
     Args:
         metric: Evaluation metric to use (default: "g-eval")
         threshold: Minimum score required to pass (default: 0.8)
@@ -119,11 +203,34 @@ def score_with(metric = "g-eval", threshold: float = 0.8):
         def generate_response(query: str) -> str:
             return "Some LLM response"
     """
+    # Resolve the metric once per decorator instead of on every call
+    offload = False
+    if callable(metric):
+        metric_name = getattr(metric, '__name__', 'custom')
+        
+        def score(input_text: str, output_text: str) -> float:
+            # Custom evaluation function
+            try:
+                return metric(input_text, output_text)
+            except Exception:
+                return _mock_deepeval_score()
+    else:
+        metric_name = metric
+        offload = os.environ.get("TRINETRI_EVAL_ASYNC") == "1"
+        
+        def score(input_text: str, output_text: str) -> float:
+            # String metric (use DeepEval)
+            return _compute_deepeval_score(
+                input_text=input_text,
+                actual_output=output_text,
+                metric=metric
+            )
+    
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Execute original function
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
                 success = True
@@ -134,19 +241,20 @@ def score_with(metric = "g-eval", threshold: float = 0.8):
                 error_msg = str(e)
                 raise
             finally:
-                end_time = time.time()
+                end_time = time.perf_counter()
                 duration_ms = (end_time - start_time) * 1000
                 
                 # Only evaluate if function succeeded and returned a result
                 if success and result is not None:
                     _emit_evaluation_span(
                         func=func,
-                        args=args, 
-                        kwargs=kwargs,
+                        input_text=_extract_input(args, kwargs),
                         result=result,
-                        metric=metric,
+                        score=score,
+                        metric_name=metric_name,
                         threshold=threshold,
-                        duration_ms=duration_ms
+                        duration_ms=duration_ms,
+                        offload=offload
                     )
                 
             return result
@@ -157,55 +265,32 @@ def score_with(metric = "g-eval", threshold: float = 0.8):
 
 def _emit_evaluation_span(
     func: Callable,
-    args: tuple,
-    kwargs: dict,
+    input_text: str,
     result: Any,
-    metric: str,
+    score: Callable[[str, str], float],
+    metric_name: str,
     threshold: float,
-    duration_ms: float
+    duration_ms: float,
+    offload: bool = False
 ):
     """
     Emit evaluation span with score and pass/fail status.
     
     Args:
         func: Original function being evaluated
-        args: Function positional arguments
-        kwargs: Function keyword arguments  
+        input_text: Evaluation input extracted from the call arguments
         result: Function return value
-        metric: Evaluation metric used
+        score: Scoring function resolved by score_with for the metric
+        metric_name: Name of the evaluation metric
         threshold: Score threshold for pass/fail
         duration_ms: Function execution duration in milliseconds
+        offload: Hand scoring to the evaluation worker queue if one is running
     """
-    tracer = trace.get_tracer(__name__)
-    
-    # Extract input for evaluation (first arg or 'input'/'query' kwargs)
-    input_text = ""
-    if args:
-        input_text = str(args[0])
-    elif 'input' in kwargs:
-        input_text = str(kwargs['input'])
-    elif 'query' in kwargs:
-        input_text = str(kwargs['query'])
-    
-    # Compute evaluation score
-    if callable(metric):
-        # Custom evaluation function
-        try:
-            score = metric(input_text, str(result))
-        except Exception:
-            score = _mock_deepeval_score()
-        metric_name = getattr(metric, '__name__', 'custom')
-    else:
-        # String metric (use DeepEval)
-        score = _compute_deepeval_score(
-            input_text=input_text,
-            actual_output=str(result),
-            metric=metric
-        )
-        metric_name = metric
+    # Stringify the output once; LLM outputs can be large
+    result_str = result if isinstance(result, str) else str(result)
     
-    # Determine pass/fail
-    eval_pass = score >= threshold
+    # Compute evaluation score (offloaded scores are filled in by the worker)
+    score_value: Optional[float] = None if offload else score(input_text, result_str)
     
     # Create evaluation span
     with tracer.start_span(f"eval:{func.__name__}") as span:
@@ -213,28 +298,101 @@ def _emit_evaluation_span(
         correlation_id = ensure_correlation_id()
         step_id = new_step_id()
         
-        span.set_attribute("agent.correlation_id", correlation_id)
-        span.set_attribute("step_id", step_id)
-        span.set_attribute("span_type", "eval")
+        if score_value is None:
+            task = EvaluationTask(
+                task_id=step_id,
+                function_name=func.__name__,
+                input_data=input_text,
+                output_data=result_str,
+                metric=metric_name,
+                threshold=threshold,
+                metadata={
+                    "span_context": span.get_span_context(),
+                    "correlation_id": correlation_id,
+                },
+            )
+            if not get_evaluation_queue().submit_threadsafe(task):
+                # No worker is consuming; evaluate inline instead
+                score_value = score(input_text, result_str)
         
-        # Evaluation-specific attributes
-        span.set_attribute("eval.metric", metric_name)
-        span.set_attribute("eval.score", score)
-        span.set_attribute("eval.threshold", threshold)
-        span.set_attribute("eval.pass", eval_pass)
+        recording = span.is_recording()
+        if recording:
+            attributes = {
+                "agent.correlation_id": correlation_id,
+                "step_id": step_id,
+                "span_type": "eval",
+                
+                # Evaluation-specific attributes
+                "eval.metric": metric_name,
+                "eval.threshold": threshold,
+                
+                # Function metadata
+                "eval.function": func.__name__,
+                "eval.input": input_text[:1000],  # Truncate
+                "eval.output": result_str[:1000],  # Truncate
+                "eval.duration_ms": duration_ms,
+            }
         
-        # Function metadata
-        span.set_attribute("eval.function", func.__name__)
-        span.set_attribute("eval.input", input_text[:1000])  # Truncate
-        span.set_attribute("eval.output", str(result)[:1000])  # Truncate
-        span.set_attribute("eval.duration_ms", duration_ms)
+        if score_value is None:
+            # Result arrives later in a linked span from the worker
+            if recording:
+                attributes["eval.pending"] = True
+                span.set_attributes(attributes)
+            return
         
-        # Set span status based on evaluation result
-        if eval_pass:
-            span.set_status(Status(StatusCode.OK, f"Evaluation passed: {score:.3f} >= {threshold}"))
-        else:
-            span.set_status(Status(StatusCode.ERROR, f"Evaluation failed: {score:.3f} < {threshold}"))
+        # Determine pass/fail
+        eval_pass = score_value >= threshold
+        if recording:
+            attributes["eval.score"] = score_value
+            attributes["eval.pass"] = eval_pass
+            span.set_attributes(attributes)
+            
+            # Set span status based on evaluation result
+            if eval_pass:
+                span.set_status(Status(StatusCode.OK, f"Evaluation passed: {score_value:.3f} >= {threshold}"))
+            else:
+                span.set_status(Status(StatusCode.ERROR, f"Evaluation failed: {score_value:.3f} < {threshold}"))
             
     # Raise error if evaluation failed
     if not eval_pass:
-        raise EvaluationError(score, threshold, metric_name) 
\ No newline at end of file
+        raise EvaluationError(score_value, threshold, metric_name)
+
+
+def _emit_deferred_evaluation_span(task: EvaluationTask, score_value: float) -> None:
+    """
+    Emit the result span for an evaluation scored by the worker.
+    
+    The span is linked to the pending evaluation span that enqueued the
+    task. Threshold failures are recorded but never raised.
+    
+    Args:
+        task: The completed evaluation task
+        score_value: Score computed for the task
+    """
+    span_context = task.metadata.get("span_context")
+    links = [Link(span_context)] if span_context is not None else None
+    eval_pass = score_value >= task.threshold
+    
+    with tracer.start_span(f"eval.result:{task.function_name}", links=links) as span:
+        if not span.is_recording():
+            return
+        
+        attributes = {
+            "step_id": task.task_id,
+            "span_type": "eval",
+            "eval.metric": task.metric,
+            "eval.score": score_value,
+            "eval.threshold": task.threshold,
+            "eval.pass": eval_pass,
+            "eval.function": task.function_name,
+            "eval.deferred": True,
+        }
+        correlation_id = task.metadata.get("correlation_id")
+        if correlation_id is not None:
+            attributes["agent.correlation_id"] = correlation_id
+        span.set_attributes(attributes)
+        
+        if eval_pass:
+            span.set_status(Status(StatusCode.OK, f"Evaluation passed: {score_value:.3f} >= {task.threshold}"))
+        else:
+            span.set_status(Status(StatusCode.ERROR, f"Evaluation failed: {score_value:.3f} < {task.threshold}"))
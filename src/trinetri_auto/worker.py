@@ -20,12 +20,62 @@ at scale in distributed environments.
 # limitations under the License.
 
 import asyncio
-from typing import Any, Dict, Optional
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger("trinetri.worker")
+
+# Queued by stop() to wake the consumer and end its loop
+_STOP = object()
+
+# Maximum number of ready tasks scored together
+BATCH_SIZE = 16
+
+# Queue bound used when TRINETRI_EVAL_QUEUE_MAX is unset or invalid
+DEFAULT_QUEUE_MAX = 1024
+
+
+def _queue_maxsize() -> int:
+    """
+    Read the evaluation queue bound from TRINETRI_EVAL_QUEUE_MAX.
+    
+    A malformed value is logged and replaced by the default rather than
+    raised, since the queue is created inside the user's decorated call.
+    
+    Returns:
+        The configured maximum queue size
+    """
+    raw = os.getenv("TRINETRI_EVAL_QUEUE_MAX")
+    if not raw:
+        return DEFAULT_QUEUE_MAX
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(
+            "Ignoring invalid TRINETRI_EVAL_QUEUE_MAX=%r; using %d", raw, DEFAULT_QUEUE_MAX
+        )
+        return DEFAULT_QUEUE_MAX
 
 
 class EvaluationTask:
     """Represents an evaluation task for processing in the queue."""
     
+    __slots__ = (
+        "task_id",
+        "function_name",
+        "input_data",
+        "output_data",
+        "metric",
+        "threshold",
+        "metadata",
+    )
+    
     def __init__(
         self,
         task_id: str,
@@ -55,13 +105,66 @@ class EvaluationQueue:
     """
     
     def __init__(self):
-        self._queue: asyncio.Queue = asyncio.Queue()
+        # Bounded so producer bursts apply backpressure instead of growing memory
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=_queue_maxsize())
         self._running = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.dropped = 0
     
     async def put(self, task: EvaluationTask) -> None:
-        """Add an evaluation task to the queue."""
+        """Add an evaluation task to the queue, waiting while it is full."""
         await self._queue.put(task)
     
+    def put_nowait(self, task: EvaluationTask) -> bool:
+        """
+        Add an evaluation task to the queue without waiting.
+        
+        Args:
+            task: The evaluation task to enqueue
+            
+        Returns:
+            bool: True if the task was queued, False if the queue was full
+            and the task was dropped (counted in ``dropped`` and logged)
+        """
+        try:
+            self._queue.put_nowait(task)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            # Its evaluation span stays pending forever, so say so
+            logger.warning(
+                "Evaluation queue full; dropped task %s for %s, its span stays "
+                "eval.pending (%d dropped so far)",
+                task.task_id, task.function_name, self.dropped,
+            )
+            return False
+        return True
+    
+    def submit_threadsafe(self, task: EvaluationTask) -> bool:
+        """
+        Hand a task to the running consumer from any thread without blocking.
+        
+        The task is queued on the consumer's loop with ``put_nowait``, so it
+        is dropped rather than buffered if the queue is full.
+        
+        Args:
+            task: The evaluation task to enqueue
+            
+        Returns:
+            bool: True if the task was scheduled, False if no consumer is running
+            or its loop has closed.
+            A scheduled task can still be dropped if the queue is full when it
+            arrives; see ``put_nowait``.
+        """
+        loop = self._loop
+        if loop is None or not self._running or loop.is_closed():
+            return False
+        try:
+            loop.call_soon_threadsafe(self.put_nowait, task)
+        except RuntimeError:
+            # The loop closed after the check above
+            return False
+        return True
+    
     async def get(self) -> EvaluationTask:
         """Get the next evaluation task from the queue."""
         return await self._queue.get()
@@ -82,57 +185,89 @@ class EvaluationQueue:
             worker_id: Identifier for this worker instance
         """
         self._running = True
-        print(f"[{worker_id}] Starting evaluation queue consumer...")
+        self._loop = asyncio.get_running_loop()
+        logger.info("[%s] Starting evaluation queue consumer...", worker_id)
         
         try:
-            while self._running:
+            stopping = False
+            while not stopping:
+                # Block until work arrives; stop() wakes us with a sentinel
+                batch = [await self._queue.get()]
+                
+                # Drain whatever else is already waiting, up to BATCH_SIZE
+                while len(batch) < BATCH_SIZE and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                
+                tasks = [task for task in batch if task is not _STOP]
+                stopping = len(tasks) != len(batch)
+                
                 try:
-                    # Wait for a task with timeout
-                    task = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                    
-                    print(f"[{worker_id}] Processing task {task.task_id}: {task.function_name}")
-                    
-                    # Placeholder processing
-                    await self._process_task(task, worker_id)
-                    
-                    # Mark task as done
-                    self._queue.task_done()
-                    
-                except asyncio.TimeoutError:
-                    # No tasks available, continue polling
-                    continue
+                    if tasks:
+                        logger.info("[%s] Processing %d task(s)", worker_id, len(tasks))
+                        
+                        # Score the batch and publish one result span per task
+                        await self._process_batch(tasks, worker_id)
                 except Exception as e:
-                    print(f"[{worker_id}] Error processing task: {e}")
-                    continue
+                    logger.error("[%s] Error processing batch: %s", worker_id, e)
+                finally:
+                    # Mark tasks (and any sentinel) as done
+                    for _ in batch:
+                        self._queue.task_done()
                     
         except KeyboardInterrupt:
-            print(f"[{worker_id}] Received interrupt, shutting down...")
+            logger.info("[%s] Received interrupt, shutting down...", worker_id)
         finally:
             self._running = False
-            print(f"[{worker_id}] Worker stopped")
+            self._loop = None
+            logger.info("[%s] Worker stopped", worker_id)
     
-    async def _process_task(self, task: EvaluationTask, worker_id: str) -> None:
+    async def _process_batch(self, tasks: List[EvaluationTask], worker_id: str) -> None:
         """
-        Process a single evaluation task.
+        Process a batch of evaluation tasks.
+        
+        Tasks are grouped by metric and each group is scored off the event
+        loop with one metric instance. Each result is published as a
+        follow-up evaluation span linked to the span that enqueued the task.
         
         Args:
-            task: The evaluation task to process
+            tasks: The evaluation tasks to process
             worker_id: Identifier for this worker
         """
-        # Simulate evaluation processing time
-        await asyncio.sleep(0.1)
+        # Imported here: eval imports this module for EvaluationTask
+        from .eval import _compute_deepeval_scores, _emit_deferred_evaluation_span
         
-        # In a real implementation, this would:
-        # 1. Run the evaluation using DeepEval
-        # 2. Store results in a database
-        # 3. Emit telemetry data
+        by_metric: Dict[str, List[EvaluationTask]] = {}
+        for task in tasks:
+            by_metric.setdefault(task.metric, []).append(task)
         
-        print(f"[{worker_id}] Completed evaluation for {task.function_name} "
-              f"with {task.metric} metric (threshold: {task.threshold})")
+        for metric, group in by_metric.items():
+            scores = await asyncio.to_thread(
+                _compute_deepeval_scores,
+                [(task.input_data, task.output_data) for task in group],
+                metric,
+            )
+            for task, score in zip(group, scores):
+                _emit_deferred_evaluation_span(task, score)
+                
+                # In a real implementation, this would also store results in a database
+                
+                logger.info(
+                    "[%s] Completed evaluation for %s with %s metric: %.3f (threshold: %s)",
+                    worker_id, task.function_name, task.metric, score, task.threshold,
+                )
     
     def stop(self) -> None:
-        """Stop the queue consumer."""
+        """
+        Stop the queue consumer.
+        
+        Safe to call from any thread; tasks queued before the call are
+        processed first.
+        """
         self._running = False
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            # Wait for room rather than put_nowait: the queue may be full
+            asyncio.run_coroutine_threadsafe(self._queue.put(_STOP), loop)
 
 
 # Global queue instance for the application
@@ -147,6 +282,73 @@ def get_evaluation_queue() -> EvaluationQueue:
     return _evaluation_queue
 
 
+# Stdout routing shared by all workers in the process: the started listener
+# and the logger level to restore, plus how many running workers use it
+_log_routing: Optional[Tuple[logging.handlers.QueueListener, int]] = None
+_log_routing_users = 0
+_log_routing_lock = threading.Lock()
+
+
+def _start_log_listener() -> bool:
+    """
+    Route worker log records to stdout through a shared background listener.
+    
+    Workers only enqueue records; a single listener thread does the
+    stream IO. The first worker installs the routing and later workers
+    reuse it. Nothing is installed if the application has configured
+    handlers anywhere on the worker logger's path (including the root
+    logger, e.g. via logging.basicConfig), so records are never printed twice.
+    
+    Returns:
+        bool: True if the caller now holds a reference to the routing and
+        must release it with _stop_log_listener, False if logging was
+        already configured
+    """
+    global _log_routing, _log_routing_users
+    
+    with _log_routing_lock:
+        if _log_routing is None:
+            if logger.hasHandlers():
+                return False
+            
+            records: queue.SimpleQueue = queue.SimpleQueue()
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(logging.Formatter("%(message)s"))
+            
+            previous_level = logger.level
+            logger.addHandler(logging.handlers.QueueHandler(records))
+            logger.setLevel(logging.INFO)
+            listener = logging.handlers.QueueListener(records, stream_handler)
+            listener.start()
+            _log_routing = (listener, previous_level)
+        
+        _log_routing_users += 1
+        return True
+
+
+def _stop_log_listener() -> None:
+    """
+    Release a reference taken by _start_log_listener.
+    
+    The last worker to release it flushes and stops the listener and
+    undoes its logger changes.
+    """
+    global _log_routing, _log_routing_users
+    
+    with _log_routing_lock:
+        _log_routing_users -= 1
+        if _log_routing_users > 0 or _log_routing is None:
+            return
+        
+        listener, previous_level = _log_routing
+        _log_routing = None
+        listener.stop()
+        for handler in list(logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is listener.queue:
+                logger.removeHandler(handler)
+        logger.setLevel(previous_level)
+
+
 async def start_worker(worker_id: str = "worker-1") -> None:
     """
     Start an evaluation worker.
@@ -154,8 +356,12 @@ async def start_worker(worker_id: str = "worker-1") -> None:
     Args:
         worker_id: Identifier for this worker instance
     """
-    queue = get_evaluation_queue()
-    await queue.consume(worker_id)
+    routed = _start_log_listener()
+    try:
+        await get_evaluation_queue().consume(worker_id)
+    finally:
+        if routed:
+            _stop_log_listener()
 
 
 # Example usage for testing
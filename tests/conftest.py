@@ -0,0 +1,138 @@
+"""
+Shared pytest fixtures for the Trinetri test suite.
+"""
+
+# Copyright 2025 Trinetri Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+
+# Source tree root; pytest itself imports from it via pythonpath in pyproject.toml
+SRC = str(Path(__file__).parent.parent / "src")
+
+
+@pytest.fixture(scope="session")
+def clean_otel_env():
+    """
+    Read-only subprocess environment without OTEL_* variables.
+    
+    Built once per session; copy with dict(clean_otel_env, KEY=value)
+    when a test needs extra variables.
+    """
+    base = {k: v for k, v in os.environ.items() if not k.startswith("OTEL_")}
+    base["PYTHONPATH"] = SRC
+    return MappingProxyType(base)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_network():
+    """
+    Fail fast on real network access instead of waiting on DNS or TCP timeouts.
+    
+    Only internet-family connects and non-loopback name lookups are blocked;
+    local socket pairs (used by asyncio event loops) keep working.
+    """
+    real_connect = socket.socket.connect
+    real_connect_ex = socket.socket.connect_ex
+    real_getaddrinfo = socket.getaddrinfo
+    
+    def guard_connect(sock, address):
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            raise OSError(f"Network access disabled in tests: {address!r}")
+        return real_connect(sock, address)
+    
+    def guard_connect_ex(sock, address):
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            raise OSError(f"Network access disabled in tests: {address!r}")
+        return real_connect_ex(sock, address)
+    
+    def guard_getaddrinfo(host, *args, **kwargs):
+        if host not in (None, "localhost", "127.0.0.1", "::1"):
+            raise socket.gaierror(f"Name resolution disabled in tests: {host!r}")
+        return real_getaddrinfo(host, *args, **kwargs)
+    
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(socket.socket, "connect", guard_connect)
+        m.setattr(socket.socket, "connect_ex", guard_connect_ex)
+        m.setattr(socket, "getaddrinfo", guard_getaddrinfo)
+        yield
+
+
+class ListExporter(SpanExporter):
+    """Collect exported spans in a plain list; only the test thread reads it."""
+    
+    def __init__(self):
+        self.spans = []
+    
+    def export(self, spans):
+        self.spans.extend(spans)
+        return SpanExportResult.SUCCESS
+    
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture(scope="session")
+def tracing():
+    """Install one SDK TracerProvider with a list exporter for the session."""
+    provider = TracerProvider()
+    exporter = ListExporter()
+    processor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=4096,
+        max_export_batch_size=256,
+        schedule_delay_millis=50,
+        export_timeout_millis=5000,
+    )
+    provider.add_span_processor(processor)
+    # The global provider can only be set once per process
+    trace.set_tracer_provider(provider)
+    
+    yield provider, exporter
+    
+    provider.shutdown()
+
+
+@pytest.fixture(scope="session")
+def sdk_tracer(tracing):
+    """Return the SDK tracer straight from the session provider, skipping the proxy."""
+    provider, _ = tracing
+    return provider.get_tracer("trinetri.test")
+
+
+@pytest.fixture
+def tracer_setup(tracing):
+    """Yield the session exporter, emptied of spans from earlier tests."""
+    provider, exporter = tracing
+    provider.force_flush(timeout_millis=1000)
+    exporter.spans.clear()
+    
+    yield exporter
+    
+    # Clean up
+    provider.force_flush(timeout_millis=1000)
+    exporter.spans.clear()
@@ -20,15 +20,57 @@ Tests the @score_with decorator, evaluation spans, and CI gating logic.
 
 import pytest
 from unittest.mock import patch, MagicMock
+import asyncio
+import sys
+import threading
 import time
+import types
 
+from trinetri_auto import eval as eval_module
 from trinetri_auto.eval import (
     score_with, 
     EvaluationError,
     _compute_deepeval_score,
-    _mock_deepeval_score
+    _mock_deepeval_score,
 )
-from trinetri_auto._ids import get_current_correlation_id
+from trinetri_auto.worker import EvaluationQueue
+
+
+@pytest.fixture
+def mock_tracer(monkeypatch):
+    """Replace the eval module tracer with a MagicMock for one test."""
+    tracer = MagicMock()
+    tracer.start_span.return_value.__enter__.return_value = MagicMock()
+    monkeypatch.setattr("trinetri_auto.eval.tracer", tracer)
+    return tracer
+
+
+@pytest.fixture
+def mock_span(mock_tracer):
+    """The span yielded by mock_tracer.start_span()."""
+    return mock_tracer.start_span.return_value.__enter__.return_value
+
+
+class AttrSpy:
+    """Records span attributes into a dict as they are set."""
+    
+    def __init__(self):
+        self.attributes = {}
+    
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+    
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+
+@pytest.fixture
+def span_attrs(mock_span):
+    """Attributes set on mock_span, whichever setter the code under test uses."""
+    spy = AttrSpy()
+    mock_span.set_attribute.side_effect = spy.set_attribute
+    mock_span.set_attributes.side_effect = spy.set_attributes
+    return spy.attributes
 
 
 class TestScoreWithDecorator:
@@ -92,29 +134,20 @@ class TestScoreWithDecorator:
         with pytest.raises(ValueError, match="Original function error"):
             failing_function("Test query")
     
-    def test_evaluation_span_creation(self):
+    def test_evaluation_span_creation(self, mock_tracer, span_attrs):
         """Test that evaluation spans are created with correct attributes."""
         
         @score_with(metric="g-eval", threshold=0.8)
         def generate_response(query: str) -> str:
             return "Test response"
         
-        # Mock OpenTelemetry components
-        mock_tracer = MagicMock()
-        mock_span = MagicMock()
-        mock_tracer.start_span.return_value.__enter__.return_value = mock_span
-        
-        with patch('trinetri_auto.eval.trace.get_tracer', return_value=mock_tracer):
-            with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
-                generate_response("Test query")
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
+            generate_response("Test query")
         
         # Verify span creation and attributes
         mock_tracer.start_span.assert_called_once_with("eval:generate_response")
         
         # Check that span attributes were set
-        span_calls = mock_span.set_attribute.call_args_list
-        span_attrs = {call[0][0]: call[0][1] for call in span_calls}
-        
         assert span_attrs["span_type"] == "eval"
         assert span_attrs["eval.metric"] == "g-eval"
         assert span_attrs["eval.score"] == 0.85
@@ -135,6 +168,22 @@ class TestScoreWithDecorator:
         with patch('trinetri_auto.eval._mock_deepeval_score', return_value=0.82):
             result = generate_response("Test")
             assert result == "Response"
+    
+    def test_non_recording_span_skips_attributes(self, mock_span):
+        """Test that a non-recording span gets no attributes but still gates."""
+        
+        @score_with(metric="g-eval", threshold=0.9)
+        def generate_response(query: str) -> str:
+            return "Response"
+        
+        mock_span.is_recording.return_value = False
+        
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.7):
+            with pytest.raises(EvaluationError):
+                generate_response("Test query")
+        
+        mock_span.set_attributes.assert_not_called()
+        mock_span.set_status.assert_not_called()
 
 
 class TestEvaluationError:
@@ -166,67 +215,88 @@ class TestDeepEvalIntegration:
         assert isinstance(score, float)
         assert 0.0 <= score <= 1.0
     
-    def test_deepeval_unavailable_fallback(self):
-        """Test that missing DeepEval falls back to mock scoring."""
-        
-        # Mock ImportError for deepeval
-        with patch('trinetri_auto.eval._compute_deepeval_score', side_effect=ImportError):
-            score = _compute_deepeval_score(
-                input_text="test input",
-                actual_output="test output"
-            )
-            assert score == 0.82  # Should use mock
-    
-    def test_deepeval_exception_fallback(self):
-        """Test that DeepEval exceptions fall back to mock scoring."""
-        
-        # Mock DeepEval to raise an exception
+    @pytest.mark.parametrize("deepeval_available, measure_error, metric", [
+        pytest.param(False, None, "g-eval", id="deepeval_unavailable"),
+        pytest.param(True, Exception("DeepEval error"), "g-eval", id="deepeval_exception"),
+        pytest.param(True, None, "faithfulness", id="unsupported_metric"),
+    ])
+    def test_deepeval_fallback(self, monkeypatch, deepeval_available, measure_error, metric):
+        """Test that DeepEval problems fall back to mock scoring."""
         mock_geval = MagicMock()
-        mock_geval.measure.side_effect = Exception("DeepEval error")
-        
-        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.82):
-            score = _compute_deepeval_score(
-                input_text="test input",
-                actual_output="test output"
-            )
-            assert score == 0.82  # Should use mock
+        mock_geval.return_value.measure.side_effect = measure_error
+        mock_geval.return_value.score = 0.91
+        deepeval = (mock_geval, MagicMock(), MagicMock()) if deepeval_available else None
+        monkeypatch.setattr(eval_module, '_DEEPEVAL', deepeval)
+        monkeypatch.setattr(eval_module, '_DEEPEVAL_TRIED', True)
+        
+        score = _compute_deepeval_score(
+            input_text="test input",
+            actual_output="test output",
+            metric=metric
+        )
+        assert score == 0.82  # Should use mock
     
-    def test_deepeval_integration_success(self):
+    def test_deepeval_integration_success(self, monkeypatch):
         """Test successful DeepEval integration."""
         
-        # Test that DeepEval integration works when available
-        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.91):
-            score = _compute_deepeval_score(
-                input_text="test input",
-                actual_output="test output",
-                metric="g-eval"
-            )
-            
-            assert score == 0.91
+        # Stand in for the cached (GEval, LLMTestCase, LLMTestCaseParams) handle
+        mock_geval = MagicMock()
+        mock_geval.return_value.score = 0.91
+        mock_test_case = MagicMock()
+        monkeypatch.setattr('trinetri_auto.eval._DEEPEVAL', (mock_geval, mock_test_case, MagicMock()))
+        monkeypatch.setattr('trinetri_auto.eval._DEEPEVAL_TRIED', True)
+        
+        score = _compute_deepeval_score(
+            input_text="test input",
+            actual_output="test output",
+            metric="g-eval"
+        )
+        
+        assert score == 0.91
+        mock_geval.return_value.measure.assert_called_once_with(mock_test_case.return_value)
+    
+    def test_deepeval_import_attempted_once(self, monkeypatch):
+        """Test that a missing DeepEval is only looked up once."""
+        monkeypatch.setattr(eval_module, '_DEEPEVAL', None)
+        monkeypatch.setattr(eval_module, '_DEEPEVAL_TRIED', False)
+        monkeypatch.setitem(sys.modules, 'deepeval', None)
+        
+        assert eval_module._get_deepeval() is None
+        assert eval_module._DEEPEVAL_TRIED is True
+        assert _compute_deepeval_score("test input", "test output") == 0.82
+    
+    def test_broken_deepeval_import_attempted_once(self, monkeypatch):
+        """Test that a DeepEval install failing with a non-ImportError is cached as missing."""
+        monkeypatch.setattr(eval_module, '_DEEPEVAL', None)
+        monkeypatch.setattr(eval_module, '_DEEPEVAL_TRIED', False)
+        
+        # Importing from deepeval.metrics raises something other than ImportError
+        broken = types.ModuleType('deepeval.metrics')
+        def raise_runtime_error(name):
+            raise RuntimeError("broken install")
+        broken.__getattr__ = raise_runtime_error
+        monkeypatch.setitem(sys.modules, 'deepeval', types.ModuleType('deepeval'))
+        monkeypatch.setitem(sys.modules, 'deepeval.metrics', broken)
+        
+        assert eval_module._get_deepeval() is None
+        assert eval_module._DEEPEVAL_TRIED is True
+        assert _compute_deepeval_score("test input", "test output") == 0.82
 
 
 class TestCorrelationIDIntegration:
     """Test that evaluation spans include correlation IDs."""
     
-    def test_correlation_id_in_evaluation_span(self):
+    def test_correlation_id_in_evaluation_span(self, span_attrs):
         """Test that evaluation spans include the current correlation ID."""
         
         @score_with(metric="g-eval", threshold=0.8)
         def test_function() -> str:
             return "test"
         
-        mock_tracer = MagicMock()
-        mock_span = MagicMock()
-        mock_tracer.start_span.return_value.__enter__.return_value = mock_span
-        
-        with patch('trinetri_auto.eval.trace.get_tracer', return_value=mock_tracer):
-            with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
-                test_function()
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
+            test_function()
         
         # Check that correlation_id was set as an attribute
-        span_calls = mock_span.set_attribute.call_args_list
-        span_attrs = {call[0][0]: call[0][1] for call in span_calls}
-        
         assert "agent.correlation_id" in span_attrs
         assert span_attrs["agent.correlation_id"] is not None
 
@@ -234,74 +304,144 @@ class TestCorrelationIDIntegration:
 class TestInputExtraction:
     """Test input extraction from different function signatures."""
     
-    def test_input_extraction_from_args(self):
+    def test_input_extraction_from_args(self, span_attrs):
         """Test extracting input from positional arguments."""
         
         @score_with(metric="g-eval", threshold=0.8)
         def func_with_args(query: str, context: str) -> str:
             return "response"
         
-        mock_tracer = MagicMock()
-        mock_span = MagicMock()
-        mock_tracer.start_span.return_value.__enter__.return_value = mock_span
-        
-        with patch('trinetri_auto.eval.trace.get_tracer', return_value=mock_tracer):
-            with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
-                func_with_args("test query", "test context")
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
+            func_with_args("test query", "test context")
         
         # Check that input was extracted from first argument
-        span_calls = mock_span.set_attribute.call_args_list
-        span_attrs = {call[0][0]: call[0][1] for call in span_calls}
-        
         assert "test query" in span_attrs["eval.input"]
     
-    def test_input_extraction_from_kwargs(self):
+    def test_input_extraction_from_kwargs(self, span_attrs):
         """Test extracting input from keyword arguments."""
         
         @score_with(metric="g-eval", threshold=0.8)
         def func_with_kwargs(*, input: str) -> str:
             return "response"
         
-        mock_tracer = MagicMock()
-        mock_span = MagicMock()
-        mock_tracer.start_span.return_value.__enter__.return_value = mock_span
-        
-        with patch('trinetri_auto.eval.trace.get_tracer', return_value=mock_tracer):
-            with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
-                func_with_kwargs(input="test input")
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
+            func_with_kwargs(input="test input")
         
         # Check that input was extracted from 'input' keyword
-        span_calls = mock_span.set_attribute.call_args_list
-        span_attrs = {call[0][0]: call[0][1] for call in span_calls}
-        
         assert "test input" in span_attrs["eval.input"]
+    
+    def test_input_extraction_from_query_keyword(self, span_attrs):
+        """Test that a positional parameter passed by keyword as 'query' is extracted."""
+        
+        @score_with(metric="g-eval", threshold=0.8)
+        def func_with_query(query: str) -> str:
+            return "response"
+        
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
+            func_with_query(query="keyword query")
+        
+        assert span_attrs["eval.input"] == "keyword query"
 
 
 class TestDurationMeasurement:
     """Test that function duration is measured and recorded."""
     
-    def test_duration_measurement(self):
+    def test_duration_measurement(self, monkeypatch, span_attrs):
         """Test that function execution duration is recorded in spans."""
         
         @score_with(metric="g-eval", threshold=0.8)
         def slow_function() -> str:
-            time.sleep(0.01)  # Small delay for testing
             return "response"
         
-        mock_tracer = MagicMock()
-        mock_span = MagicMock()
-        mock_tracer.start_span.return_value.__enter__.return_value = mock_span
-        
-        with patch('trinetri_auto.eval.trace.get_tracer', return_value=mock_tracer):
-            with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.85):
+            with monkeypatch.context() as m:
+                # Start and end samples 5ms apart
+                m.setattr("trinetri_auto.eval.time.perf_counter", iter([0.0, 0.005]).__next__)
                 slow_function()
         
-        # Check that duration was measured and is reasonable
-        span_calls = mock_span.set_attribute.call_args_list
-        span_attrs = {call[0][0]: call[0][1] for call in span_calls}
+        # Check that duration was measured from the clock samples
+        assert span_attrs["eval.duration_ms"] == pytest.approx(5.0)
+
+
+class TestAsyncEvaluation:
+    """Test offloading DeepEval scoring to the evaluation worker."""
+    
+    def test_offload_to_running_worker(self, monkeypatch, span_attrs):
+        """Test that scoring runs in the worker and gating becomes advisory."""
+        monkeypatch.setenv("TRINETRI_EVAL_ASYNC", "1")
+        queue = EvaluationQueue()
+        monkeypatch.setattr("trinetri_auto.eval.get_evaluation_queue", lambda: queue)
+        
+        loop = asyncio.new_event_loop()
+        worker = threading.Thread(
+            target=loop.run_until_complete, args=(queue.consume("test-worker"),), daemon=True
+        )
+        worker.start()
+        deadline = time.monotonic() + 5
+        while queue._loop is None and time.monotonic() < deadline:
+            time.sleep(0.001)
         
-        assert "eval.duration_ms" in span_attrs
-        duration = span_attrs["eval.duration_ms"]
-        assert isinstance(duration, float)
-        assert duration > 0  # Should be positive
-        assert duration < 1000  # Should be less than 1 second for this test 
\ No newline at end of file
+        @score_with(metric="g-eval", threshold=0.9)
+        def generate_response(query: str) -> str:
+            return "Low quality response"
+        
+        done = threading.Event()
+        deferred = []
+        
+        def record(task, score):
+            deferred.append((task, score))
+            done.set()
+        
+        try:
+            with patch('trinetri_auto.eval._compute_deepeval_scores', side_effect=lambda cases, metric: [0.5] * len(cases)), \
+                    patch('trinetri_auto.eval._emit_deferred_evaluation_span', side_effect=record):
+                # Below threshold, but the score is not known yet: no EvaluationError
+                assert generate_response("Test query") == "Low quality response"
+                assert done.wait(timeout=5)
+        finally:
+            queue.stop()
+            worker.join(timeout=5)
+            loop.close()
+        
+        assert span_attrs["eval.pending"] is True
+        assert "eval.score" not in span_attrs
+        
+        task, score = deferred[0]
+        assert score == 0.5
+        assert task.function_name == "generate_response"
+        assert task.input_data == "Test query"
+        assert task.task_id == span_attrs["step_id"]
+    
+    def test_offload_without_worker_scores_inline(self, monkeypatch):
+        """Test that async mode falls back to inline gating when no worker runs."""
+        monkeypatch.setenv("TRINETRI_EVAL_ASYNC", "1")
+        monkeypatch.setattr("trinetri_auto.eval.get_evaluation_queue", EvaluationQueue)
+        
+        @score_with(metric="g-eval", threshold=0.9)
+        def generate_response(query: str) -> str:
+            return "Low quality response"
+        
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.5):
+            with pytest.raises(EvaluationError):
+                generate_response("Test query")
+    
+    def test_offload_to_closing_worker_scores_inline(self, monkeypatch):
+        """Test that a worker loop closing mid-submit falls back to inline gating."""
+        monkeypatch.setenv("TRINETRI_EVAL_ASYNC", "1")
+        queue = EvaluationQueue()
+        monkeypatch.setattr("trinetri_auto.eval.get_evaluation_queue", lambda: queue)
+        
+        # The loop closes between submit_threadsafe's is_closed() check and the call
+        loop = asyncio.new_event_loop()
+        loop.close()
+        monkeypatch.setattr(loop, "is_closed", lambda: False)
+        queue._loop = loop
+        queue._running = True
+        
+        @score_with(metric="g-eval", threshold=0.9)
+        def generate_response(query: str) -> str:
+            return "Low quality response"
+        
+        with patch('trinetri_auto.eval._compute_deepeval_score', return_value=0.5):
+            with pytest.raises(EvaluationError):
+                generate_response("Test query")
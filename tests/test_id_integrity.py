@@ -18,8 +18,20 @@ Tests to ensure correlation IDs and step IDs are properly maintained across span
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextvars
+import uuid
+
 import pytest
-from unittest.mock import Mock, patch
+
+from trinetri_auto._ids import _correlation_id_var
+
+
+@pytest.fixture(autouse=True)
+def _restore_correlation_id():
+    """Undo any correlation ID a test sets in the shared context."""
+    token = _correlation_id_var.set(_correlation_id_var.get())
+    yield
+    _correlation_id_var.reset(token)
 
 
 def test_correlation_id_consistency():
@@ -41,6 +53,18 @@ def test_correlation_id_consistency():
     assert retrieved_id == correlation_id
 
 
+def test_correlation_id_is_uuid4():
+    """Test that correlation IDs are canonical version 4 UUID strings."""
+    from trinetri_auto._ids import new_correlation_id
+    
+    for _ in range(100):
+        correlation_id = new_correlation_id()
+        parsed = uuid.UUID(correlation_id)
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+        assert str(parsed) == correlation_id
+
+
 def test_multiple_spans_same_correlation():
     """Test creating multiple spans with the same correlation ID."""
     from trinetri_auto._ids import new_correlation_id, get_correlation_id
@@ -66,21 +90,21 @@ def test_multiple_spans_same_correlation():
     assert span2.get_attribute("agent.role") == "role2"
 
 
-@patch('trinetri_auto.agent.tracer')
-def test_agent_instrumentation_correlation(mock_tracer):
+def test_agent_instrumentation_correlation(tracing, tracer_setup):
     """Test that agent instrumentation maintains correlation ID."""
     from trinetri_auto._ids import new_correlation_id
     from trinetri_auto.agent import instrument_agent
     
-    # Set up mock span
-    mock_span = Mock()
-    mock_tracer.start_as_current_span.return_value.__enter__.return_value = mock_span
+    exporter = tracer_setup
+    provider, _ = tracing
     
     # Create a correlation ID
     correlation_id = new_correlation_id()
     
     # Create and instrument an agent
     class TestAgent:
+        __slots__ = ()
+        
         def run(self, task: str) -> str:
             return f"Completed: {task}"
     
@@ -89,69 +113,100 @@ def test_agent_instrumentation_correlation(mock_tracer):
     
     # Run the agent
     result = agent.run("test task")
+    provider.force_flush()
+    
+    # Verify the span was exported with correct attributes
+    spans = exporter.spans
+    assert len(spans) == 1
+    attrs = spans[0].attributes
+    assert attrs["agent.correlation_id"] == correlation_id
+    assert attrs["agent.role"] == "test_role"
     
-    # Verify the span was created with correct attributes
-    mock_tracer.start_as_current_span.assert_called_once()
-    span_calls = mock_span.set_attribute.call_args_list
+    assert result == "Completed: test task"
+
+
+def test_agent_wrapper_records_error_and_enum_role(tracing, tracer_setup):
+    """Test the agent wrapper with a str Enum role and a failing method."""
+    import enum
+    from opentelemetry.trace import StatusCode
+    from trinetri_auto.agent import instrument_agent
     
-    # Find the correlation_id attribute call
-    correlation_calls = [call for call in span_calls 
-                        if call[0][0] == "agent.correlation_id"]
-    assert len(correlation_calls) == 1
-    assert correlation_calls[0][0][1] == correlation_id
+    exporter = tracer_setup
+    provider, _ = tracing
     
-    # Verify role is set correctly
-    role_calls = [call for call in span_calls if call[0][0] == "agent.role"]
-    assert len(role_calls) == 1
-    assert role_calls[0][0][1] == "test_role"
+    class Role(str, enum.Enum):
+        PLANNER = "planner"
     
-    assert result == "Completed: test task"
+    class FailingAgent:
+        def run(self, task: str) -> str:
+            raise ValueError(f"cannot {task}")
+    
+    InstrumentedAgent = instrument_agent(FailingAgent, role=Role.PLANNER)
+    
+    with pytest.raises(ValueError):
+        InstrumentedAgent().run("plan")
+    provider.force_flush()
+    
+    (span,) = exporter.spans
+    assert span.name == "FailingAgent.run"
+    assert span.attributes["agent.role"] == "planner"
+    assert span.attributes["agent.class_name"] == "FailingAgent"
+    assert span.attributes["agent.method_name"] == "run"
+    assert span.status.status_code is StatusCode.ERROR
+    assert "cannot plan" in span.status.description
+    assert span.events[0].name == "exception"
 
 
 def test_context_isolation():
     """Test that correlation IDs are isolated between different contexts."""
     from trinetri_auto._ids import new_correlation_id, get_correlation_id
-    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
     
-    async def task_with_correlation():
-        # Each task should get its own correlation ID
-        task_correlation_id = new_correlation_id()
+    def set_and_read():
+        new_correlation_id()
         return get_correlation_id()
     
-    async def test_isolation():
-        # Create multiple tasks
-        tasks = [task_with_correlation() for _ in range(3)]
-        results = await asyncio.gather(*tasks)
-        
-        # All results should be different (different correlation IDs)
-        assert len(set(results)) == 3
-        
-        # Each should be a valid UUID
-        for correlation_id in results:
-            assert len(correlation_id) == 36
-            assert correlation_id.count("-") == 4
+    def task_with_correlation(_):
+        # Each task runs in its own explicit copy of the current context
+        return contextvars.copy_context().run(set_and_read)
+    
+    outer_correlation_id = get_correlation_id()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(task_with_correlation, range(3)))
+    
+    # All results should be different (different correlation IDs)
+    assert len(set(results)) == len(results)
+    
+    # Each should be a valid UUID
+    for correlation_id in results:
+        assert len(correlation_id) == 36
+        assert correlation_id.count("-") == 4
     
-    # Run the async test
-    asyncio.run(test_isolation())
+    # Nothing leaked back into the caller's context
+    assert get_correlation_id() == outer_correlation_id
 
 
 def test_ensure_correlation_id_creates_if_missing():
     """Test that ensure_correlation_id creates a new ID if none exists."""
-    from trinetri_auto._ids import ensure_correlation_id, get_correlation_id, _correlation_id_var
+    from trinetri_auto._ids import ensure_correlation_id, get_correlation_id
     
-    # Clear any existing correlation ID
-    _correlation_id_var.set(None)
-    
-    # Verify no correlation ID exists
-    assert get_correlation_id() is None
-    
-    # Ensure correlation ID should create a new one
-    correlation_id = ensure_correlation_id()
+    def check():
+        # Clear any existing correlation ID
+        _correlation_id_var.set(None)
+        
+        # Verify no correlation ID exists
+        assert get_correlation_id() is None
+        
+        # Ensure correlation ID should create a new one
+        correlation_id = ensure_correlation_id()
+        
+        # Verify it was created and set
+        assert correlation_id is not None
+        assert len(correlation_id) == 36
+        assert get_correlation_id() == correlation_id
     
-    # Verify it was created and set
-    assert correlation_id is not None
-    assert len(correlation_id) == 36
-    assert get_correlation_id() == correlation_id
+    # Run in a copy so the cleared ID never touches the test's own context
+    contextvars.copy_context().run(check)
 
 
 def test_step_and_agent_id_uniqueness():
@@ -162,20 +217,13 @@ def test_step_and_agent_id_uniqueness():
     agent_ids = [new_agent_id() for _ in range(10)]
     step_ids = [new_step_id() for _ in range(10)]
     
-    # All agent IDs should be unique
-    assert len(set(agent_ids)) == 10
-    
-    # All step IDs should be unique
-    assert len(set(step_ids)) == 10
+    # All IDs should be unique
+    assert len(set(agent_ids)) == len(agent_ids)
+    assert len(set(step_ids)) == len(step_ids)
     
     # All should have correct format
-    for agent_id in agent_ids:
-        assert agent_id.startswith("agt-")
-        assert len(agent_id) == 16
-    
-    for step_id in step_ids:
-        assert step_id.startswith("stp-")
-        assert len(step_id) == 16
+    assert all(aid.startswith("agt-") and len(aid) == 16 for aid in agent_ids)
+    assert all(sid.startswith("stp-") and len(sid) == 16 for sid in step_ids)
 
 
 if __name__ == "__main__":
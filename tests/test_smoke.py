@@ -37,6 +37,8 @@ def test_instrument_agent():
     
     # Create a dummy agent class
     class DummyAgent:
+        __slots__ = ()
+        
         def run(self, task: str) -> str:
             return f"Completed: {task}"
     
@@ -51,6 +53,44 @@ def test_instrument_agent():
     assert InstrumentedAgent is not None
 
 
+def test_instrument_agent_fallback_method():
+    """Test that agents without run/act get their first public method wrapped."""
+    import trinetri_auto
+    
+    class BaseAgent:
+        def execute(self, task: str) -> str:
+            return f"Executed: {task}"
+    
+    class DerivedAgent(BaseAgent):
+        pass
+    
+    original_execute = BaseAgent.execute
+    InstrumentedAgent = trinetri_auto.instrument_agent(DerivedAgent, role="test")
+    
+    assert InstrumentedAgent.execute is not original_execute
+    assert InstrumentedAgent.execute.__name__ == "execute"
+    assert InstrumentedAgent().execute("task") == "Executed: task"
+
+
+def test_instrument_agent_fallback_uses_definition_order():
+    """Test that the fallback wraps the first method defined, not the first alphabetically."""
+    import trinetri_auto
+    
+    class PlanningAgent:
+        def plan(self, task: str) -> str:
+            return f"Planned: {task}"
+        
+        def execute(self, task: str) -> str:
+            return f"Executed: {task}"
+    
+    original_plan = PlanningAgent.plan
+    original_execute = PlanningAgent.execute
+    InstrumentedAgent = trinetri_auto.instrument_agent(PlanningAgent, role="test")
+    
+    assert InstrumentedAgent.plan is not original_plan
+    assert InstrumentedAgent.execute is original_execute
+
+
 def test_score_with_decorator():
     """Test that score_with decorator is available and works."""
     import trinetri_auto
@@ -73,6 +113,8 @@ def test_mock_langgraph_workflow(mock_patch_langgraph):
     
     # Create a mock workflow
     class MockWorkflow:
+        __slots__ = ('steps',)
+        
         def __init__(self):
             self.steps = []
         
@@ -0,0 +1,256 @@
+"""
+Tests for the async evaluation worker in Trinetri.
+
+Tests queue consumption, task processing and consumer shutdown.
+"""
+
+# Copyright 2025 Trinetri Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from unittest.mock import patch
+
+from trinetri_auto.worker import (
+    BATCH_SIZE,
+    DEFAULT_QUEUE_MAX,
+    EvaluationQueue,
+    EvaluationTask,
+    get_evaluation_queue,
+    logger,
+    start_worker,
+)
+
+
+def _make_task(i: int = 0) -> EvaluationTask:
+    return EvaluationTask(
+        task_id=f"task-{i}",
+        function_name="generate_response",
+        input_data=f"Test input {i}",
+        output_data=f"Test output {i}",
+    )
+
+
+class TestEvaluationQueue:
+    """Test the EvaluationQueue consumer loop."""
+    
+    def test_stop_wakes_idle_consumer(self):
+        """Test that stop() ends a consumer blocked on an empty queue."""
+        async def run():
+            queue = EvaluationQueue()
+            consumer = asyncio.create_task(queue.consume("test-worker"))
+            await asyncio.sleep(0)
+            queue.stop()
+            await asyncio.wait_for(consumer, timeout=1)
+            assert queue._loop is None
+        
+        asyncio.run(run())
+    
+    def test_tasks_before_stop_are_processed(self):
+        """Test that tasks queued before stop() are processed in order."""
+        processed = []
+        
+        async def fake_process(self, tasks, worker_id):
+            processed.extend(task.task_id for task in tasks)
+        
+        async def run():
+            queue = EvaluationQueue()
+            consumer = asyncio.create_task(queue.consume("test-worker"))
+            await asyncio.sleep(0)
+            for i in range(3):
+                await queue.put(_make_task(i))
+            queue.stop()
+            await asyncio.wait_for(consumer, timeout=1)
+        
+        with patch.object(EvaluationQueue, "_process_batch", fake_process):
+            asyncio.run(run())
+        
+        assert processed == ["task-0", "task-1", "task-2"]
+    
+    def test_processing_error_does_not_stop_consumer(self):
+        """Test that a failing task is marked done and the consumer continues."""
+        processed = []
+        
+        async def flaky_process(self, tasks, worker_id):
+            if tasks[0].task_id == "task-0":
+                raise RuntimeError("boom")
+            processed.extend(task.task_id for task in tasks)
+        
+        async def run():
+            queue = EvaluationQueue()
+            consumer = asyncio.create_task(queue.consume("test-worker"))
+            await queue.put(_make_task(0))
+            await asyncio.wait_for(queue._queue.join(), timeout=1)
+            await queue.put(_make_task(1))
+            await asyncio.wait_for(queue._queue.join(), timeout=1)
+            queue.stop()
+            await asyncio.wait_for(consumer, timeout=1)
+        
+        with patch.object(EvaluationQueue, "_process_batch", flaky_process):
+            asyncio.run(run())
+        
+        assert processed == ["task-1"]
+    
+    def test_ready_tasks_are_batched(self):
+        """Test that tasks already waiting are drained into one batch."""
+        batches = []
+        
+        async def fake_process(self, tasks, worker_id):
+            batches.append([task.task_id for task in tasks])
+        
+        async def run():
+            queue = EvaluationQueue()
+            for i in range(BATCH_SIZE + 2):
+                await queue.put(_make_task(i))
+            consumer = asyncio.create_task(queue.consume("test-worker"))
+            await asyncio.wait_for(queue._queue.join(), timeout=1)
+            queue.stop()
+            await asyncio.wait_for(consumer, timeout=1)
+        
+        with patch.object(EvaluationQueue, "_process_batch", fake_process):
+            asyncio.run(run())
+        
+        assert [len(batch) for batch in batches] == [BATCH_SIZE, 2]
+    
+    def test_batch_scores_each_metric_once(self):
+        """Test that a batch is scored with one call per metric."""
+        tasks = [_make_task(0), _make_task(1), _make_task(2)]
+        tasks[2].metric = "faithfulness"
+        
+        def fake_scores(cases, metric):
+            return [0.9] * len(cases)
+        
+        with patch("trinetri_auto.eval._compute_deepeval_scores", side_effect=fake_scores) as mock_scores, \
+                patch("trinetri_auto.eval._emit_deferred_evaluation_span") as mock_emit:
+            asyncio.run(EvaluationQueue()._process_batch(tasks, "test-worker"))
+        
+        assert mock_scores.call_count == 2
+        assert mock_scores.call_args_list[0][0] == (
+            [("Test input 0", "Test output 0"), ("Test input 1", "Test output 1")], "g-eval"
+        )
+        assert [call[0] for call in mock_emit.call_args_list] == [
+            (tasks[0], 0.9), (tasks[1], 0.9), (tasks[2], 0.9)
+        ]
+    
+    def test_task_has_no_instance_dict(self):
+        """Test that EvaluationTask stores its fields in slots."""
+        task = _make_task()
+        
+        assert not hasattr(task, "__dict__")
+        assert task.metric == "g-eval"
+    
+    def test_put_nowait_drops_when_full(self, monkeypatch, caplog):
+        """Test that a full queue drops non-blocking puts, counts and logs them."""
+        monkeypatch.setenv("TRINETRI_EVAL_QUEUE_MAX", "2")
+        queue = EvaluationQueue()
+        
+        with caplog.at_level(logging.WARNING, logger=logger.name):
+            assert [queue.put_nowait(_make_task(i)) for i in range(3)] == [True, True, False]
+        assert queue.dropped == 1
+        assert "dropped task task-2" in caplog.text
+    
+    def test_invalid_queue_max_falls_back_to_default(self, monkeypatch, caplog):
+        """Test that a malformed TRINETRI_EVAL_QUEUE_MAX is logged, not raised."""
+        monkeypatch.setenv("TRINETRI_EVAL_QUEUE_MAX", "lots")
+        
+        with caplog.at_level(logging.WARNING, logger=logger.name):
+            queue = EvaluationQueue()
+        assert queue._queue.maxsize == DEFAULT_QUEUE_MAX
+        assert "TRINETRI_EVAL_QUEUE_MAX" in caplog.text
+    
+    def test_stop_with_full_queue(self, monkeypatch):
+        """Test that stop() still reaches a consumer whose queue is full."""
+        monkeypatch.setenv("TRINETRI_EVAL_QUEUE_MAX", "1")
+        processed = []
+        
+        async def fake_process(self, tasks, worker_id):
+            processed.extend(task.task_id for task in tasks)
+        
+        async def run():
+            queue = EvaluationQueue()
+            consumer = asyncio.create_task(queue.consume("test-worker"))
+            await asyncio.sleep(0)
+            queue.put_nowait(_make_task(0))
+            queue.stop()
+            await asyncio.wait_for(consumer, timeout=1)
+        
+        with patch.object(EvaluationQueue, "_process_batch", fake_process):
+            asyncio.run(run())
+        
+        assert processed == ["task-0"]
+    
+    def test_start_worker_logs_through_listener(self, capsys, monkeypatch):
+        """Test that start_worker installs and removes its log listener."""
+        # No application logging configured (pytest adds its own root handlers)
+        monkeypatch.setattr(logging.root, "handlers", [])
+        level_before = logger.level
+        
+        async def run():
+            queue = get_evaluation_queue()
+            worker = asyncio.create_task(start_worker("test-worker"))
+            await asyncio.sleep(0)
+            queue.stop()
+            await asyncio.wait_for(worker, timeout=1)
+        
+        with patch("trinetri_auto.worker._evaluation_queue", EvaluationQueue()):
+            asyncio.run(run())
+        
+        assert "[test-worker] Worker stopped" in capsys.readouterr().out
+        assert logger.handlers == []
+        assert logger.level == level_before
+    
+    def test_concurrent_workers_share_log_listener(self, capsys, monkeypatch):
+        """Test that a worker keeps logging to stdout after another worker exits."""
+        monkeypatch.setattr(logging.root, "handlers", [])
+        level_before = logger.level
+        first_queue, second_queue = EvaluationQueue(), EvaluationQueue()
+        queues = iter([first_queue, second_queue])
+        
+        async def run():
+            first = asyncio.create_task(start_worker("first-worker"))
+            second = asyncio.create_task(start_worker("second-worker"))
+            await asyncio.sleep(0)
+            
+            first_queue.stop()
+            await asyncio.wait_for(first, timeout=1)
+            assert len(logger.handlers) == 1
+            
+            second_queue.stop()
+            await asyncio.wait_for(second, timeout=1)
+        
+        with patch("trinetri_auto.worker.get_evaluation_queue", lambda: next(queues)):
+            asyncio.run(run())
+        
+        assert "[second-worker] Worker stopped" in capsys.readouterr().out
+        assert logger.handlers == []
+        assert logger.level == level_before
+    
+    def test_start_worker_defers_to_configured_logging(self, capsys, caplog):
+        """Test that records go only to existing handlers when the app configured logging."""
+        caplog.set_level(logging.INFO, logger=logger.name)
+        
+        async def run():
+            queue = get_evaluation_queue()
+            worker = asyncio.create_task(start_worker("test-worker"))
+            await asyncio.sleep(0)
+            queue.stop()
+            await asyncio.wait_for(worker, timeout=1)
+        
+        with patch("trinetri_auto.worker._evaluation_queue", EvaluationQueue()):
+            asyncio.run(run())
+        
+        stopped = [r for r in caplog.records if r.getMessage() == "[test-worker] Worker stopped"]
+        assert len(stopped) == 1
+        assert "Worker stopped" not in capsys.readouterr().out
+        assert logger.handlers == []